@@ -1,18 +1,38 @@
 import streamlit as st
 import os
+import hashlib
+import html
+import logging
+import traceback
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 import yaml
-from typing import Dict, Any
-import plotly.graph_objects as go
-import plotly.express as px
-import pandas as pd
+import orjson
+from typing import Dict, Any, List
+from bisect import bisect_right
+from collections import Counter, defaultdict
+from itertools import chain
+from operator import attrgetter
 from datetime import datetime
 
-from src.graph.evaluation_graph import EvaluationOrchestrator
-from src.models.evaluation import MigrationPhase
+try:
+    from yaml import CSafeDumper as YamlDumper
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeDumper as YamlDumper
+
+try:
+    from xxhash import xxh3_128_hexdigest
+except ImportError:  # xxhash not installed
+    xxh3_128_hexdigest = None
+
+from pydantic import TypeAdapter
+
+from src.models.evaluation import Gap, Recommendation
 from src.models.evaluation_types import EvaluationType, EVALUATION_CONFIGS
-from src.agents.sow_evaluator import evaluate_sow_document
-from src.graph.proposal_generation_graph import ProposalGenerationOrchestrator
+from src.models.proposal_generation import GenAITool
+from src.utils.document_parser import DocumentParser
+
+logger = logging.getLogger(__name__)
 
 # Load environment variables
 load_dotenv()
@@ -24,129 +44,305 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS
-st.markdown("""
-<style>
-    .main-header {
-        font-size: 2.5rem;
-        font-weight: bold;
-        color: #1f77b4;
-        text-align: center;
-        margin-bottom: 2rem;
-    }
-    .score-card {
-        background-color: var(--background-color);
-        padding: 1rem;
-        border-radius: 0.5rem;
-        margin: 0.5rem 0;
-        border: 1px solid var(--border-color);
-        color: var(--text-color);
-    }
-    .critical-gap {
-        background-color: rgba(244, 67, 54, 0.1);
-        border-left: 4px solid #f44336;
-        padding: 1rem;
-        margin: 0.5rem 0;
-        color: #f44336;
-        border-radius: 4px;
-    }
-    .high-gap {
-        background-color: rgba(255, 152, 0, 0.1);
-        border-left: 4px solid #ff9800;
-        padding: 1rem;
-        margin: 0.5rem 0;
-        color: #ff9800;
-        border-radius: 4px;
-    }
-    .recommendation {
-        background-color: rgba(76, 175, 80, 0.1);
-        border-left: 4px solid #4caf50;
-        padding: 1rem;
-        margin: 0.5rem 0;
-        color: #4caf50;
-        border-radius: 4px;
-    }
-    
-    /* Dark mode support */
-    @media (prefers-color-scheme: dark) {
-        :root {
-            --text-color: #ffffff;
-            --background-color: #262730;
-            --border-color: #464853;
+# Custom CSS, served as a static file (server.enableStaticServing) so each rerun only sends the link
+st.markdown('<link rel="stylesheet" href="app/static/custom.css">', unsafe_allow_html=True)
+
+
+# Selectbox options and sidebar text for each evaluation type; the configs are static
+_EVALUATION_OPTIONS = {config.name: eval_type for eval_type, config in EVALUATION_CONFIGS.items()}
+_EVALUATION_OPTION_NAMES = tuple(_EVALUATION_OPTIONS)
+_EVALUATION_INFO = {
+    eval_type: (
+        f"**{config.name}**\n\n{config.description}",
+        "\n\n".join(f"• {criterion}" for criterion in config.evaluation_criteria)
+    )
+    for eval_type, config in EVALUATION_CONFIGS.items()
+}
+
+# Project context choices for the proposal generator sidebar
+_BUSINESS_DRIVER_OPTIONS = (
+    "Cost Optimization",
+    "Digital Transformation",
+    "Scalability & Performance",
+    "Security & Compliance",
+    "Innovation & Agility",
+    "Data Center Exit",
+    "Disaster Recovery",
+    "Modernization",
+    "Competitive Advantage",
+    "Regulatory Requirements"
+)
+_TARGET_CLOUD_OPTIONS = ("AWS", "Microsoft Azure", "Google Cloud", "Multi-Cloud", "Hybrid", "Not Specified")
+_MIGRATION_APPROACH_OPTIONS = ("Lift & Shift First", "Modernize Where Possible", "Cloud-Native Transformation", "Hybrid Approach", "Not Specified")
+_TIMELINE_OPTIONS = ("Flexible", "Moderate (6-12 months)", "Urgent (3-6 months)", "Critical (<3 months)", "Not Specified")
+_BUDGET_OPTIONS = ("Flexible", "Moderate Budget", "Cost-Conscious", "Minimal Budget", "Not Specified")
+_RISK_TOLERANCE_OPTIONS = ("Conservative", "Moderate", "Aggressive", "Not Specified")
+_COMPLIANCE_OPTIONS = ("GDPR", "HIPAA", "SOX", "PCI-DSS", "ISO 27001", "FedRAMP", "SOC 2", "None", "Other")
+
+
+@st.cache_resource
+def _get_eval_orchestrator():
+    """Build the migration evaluation orchestrator once per server process."""
+    from src.graph.evaluation_graph import EvaluationOrchestrator
+    return EvaluationOrchestrator()
+
+
+@st.cache_resource
+def _get_proposal_orchestrator():
+    """Build the proposal generation orchestrator once per server process."""
+    from src.graph.proposal_generation_graph import ProposalGenerationOrchestrator
+    return ProposalGenerationOrchestrator()
+
+
+# Parses new uploads off the script thread while the rest of the sidebar renders
+_UPLOAD_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="upload-prep")
+
+
+def _hash_bytes(content: bytes) -> str:
+    """Content hash used as the cache key for an upload; it only needs to avoid accidental collisions."""
+    if xxh3_128_hexdigest is not None:
+        return xxh3_128_hexdigest(content)
+    return hashlib.sha256(content).hexdigest()
+
+
+def _start_upload_prep(uploaded_file, file_bytes: bytes) -> Dict[str, Any]:
+    """Hash a newly uploaded file and start parsing it in the background, once per upload.
+
+    The hash is needed straight away as the cache key, so only the parse runs on the executor; it
+    overlaps with rendering the rest of the sidebar.
+    """
+    prep = st.session_state.get("upload_prep")
+    
+    if prep is None or prep["file_id"] != uploaded_file.file_id:
+        prep = {
+            "file_id": uploaded_file.file_id,
+            "hash": _hash_bytes(file_bytes),
+            "parsed": _UPLOAD_EXECUTOR.submit(DocumentParser.parse_document, file_bytes, uploaded_file.name)
         }
-    }
+        st.session_state.upload_prep = prep
     
-    /* Light mode support */
-    @media (prefers-color-scheme: light) {
-        :root {
-            --text-color: #262730;
-            --background-color: #ffffff;
-            --border-color: #e0e0e0;
-        }
-    }
+    return prep
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _parse_document_cached(file_hash: str, _file_content: bytes, filename: str, _parsed=None):
+    """Parse an uploaded document once per content hash and filename.
+
+    ``_parsed`` is the upload's background parse future, if one was started for this content;
+    it is excluded from the cache key like ``_file_content``.
+    """
+    if _parsed is not None:
+        return _parsed.result()
     
-    /* Force text visibility in dark mode */
-    [data-theme="dark"] .stMarkdown,
-    [data-theme="dark"] .stText,
-    [data-theme="dark"] div[data-testid="stMarkdownContainer"] p,
-    [data-theme="dark"] div[data-testid="stMarkdownContainer"] li,
-    [data-theme="dark"] div[data-testid="stMarkdownContainer"] strong {
-        color: #ffffff !important;
-    }
+    return DocumentParser.parse_document(_file_content, filename)
+
+
+class _ProgressDisplay:
+    """Collapsed status box whose label is only re-sent when the stage or percentage changes."""
+    
+    def __init__(self, label: str = "Starting evaluation..."):
+        # Held in a placeholder so the whole box can be removed in one message
+        self.placeholder = st.empty()
+        self.status = self.placeholder.status(label, expanded=False)
+        self.label = label
+        self.stage = label
+    
+    def update(self, pct: int, stage: str = None):
+        self.stage = stage or self.stage
+        label = f"{self.stage} ({pct}%)"
+        if label != self.label:
+            self.status.update(label=label, state="complete" if pct >= 100 else "running")
+            self.label = label
+    
+    def clear(self):
+        self.placeholder.empty()
+
+
+def _track_progress(events) -> Dict[str, Any]:
+    """Render streamed progress events and return the result carried by the final one.
+
+    The status box is created and cleared here so that replaying a cached call leaves nothing behind.
+    """
+    progress = _ProgressDisplay()
+    result = None
     
-    /* Force text visibility in light mode */
-    [data-theme="light"] .stMarkdown,
-    [data-theme="light"] .stText,
-    [data-theme="light"] div[data-testid="stMarkdownContainer"] p,
-    [data-theme="light"] div[data-testid="stMarkdownContainer"] li,
-    [data-theme="light"] div[data-testid="stMarkdownContainer"] strong {
-        color: #262730 !important;
-    }
+    try:
+        for event in events:
+            progress.update(event["pct"], event["stage"])
+            result = event.get("result", result)
+    finally:
+        progress.clear()
     
-    /* Universal text fixes for both themes */
-    .stMarkdown p, .stMarkdown li, .stMarkdown strong {
-        color: inherit !important;
-    }
+    return result
+
+
+class _EvaluationFailed(Exception):
+    """Carries a failed result out of ``_evaluate_cached`` so that Streamlit does not cache it."""
     
-    /* Ensure expander content is visible in both themes */
-    .streamlit-expanderContent {
-        color: inherit;
-    }
+    def __init__(self, result: Dict[str, Any]):
+        super().__init__(result.get("error", "Unknown error"))
+        self.result = result
+
+
+def _freeze_context(proposal_context) -> tuple:
+    """Hashable copy of the proposal context, with its lists as tuples, for use in a cache key."""
+    return tuple(sorted(
+        (key, tuple(value) if isinstance(value, list) else value)
+        for key, value in (proposal_context or {}).items()
+    ))
+
+
+# Bump when prompts, agents or the shape of a result change, so cached results from the old code are not served
+_EVALUATION_CACHE_VERSION = 1
+
+# Seconds a cached result is kept; Streamlit ignores ttl for disk-persisted caches, so results stay in memory
+_EVALUATION_CACHE_TTL = 3600
+
+# Proposal state fields rendered by display_proposal_generator_results and its exports
+_PROPOSAL_OUTPUT_FIELDS = (
+    "applications",
+    "classified_workloads",
+    "wave_groups",
+    "migration_waves",
+    "sprint_estimates",
+    "migration_strategies",
+    "architecture_recommendations",
+    "genai_tool_plans",
+    "markdown_output",
+)
+
+
+def _proposal_outputs_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Reduce a successful proposal result to the outputs the UI renders, dropping the full graph state."""
+    state = result["proposal_state"]
+    get = _accessor([state])
+    outputs = dict(result.get("outputs") or {})
+    outputs.update(
+        (field, value) for field in _PROPOSAL_OUTPUT_FIELDS
+        if (value := get(state, field)) is not None
+    )
     
-    /* Fix metric text colors for both themes */
-    .metric-container {
-        padding: 1rem;
-        border-radius: 0.5rem;
-        border: 1px solid var(--border-color);
-        background-color: var(--background-color);
-        color: var(--text-color);
-    }
+    slim = {key: value for key, value in result.items() if key != "proposal_state"}
+    slim["outputs"] = outputs
+    return slim
+
+
+@st.cache_data(show_spinner=False, ttl=_EVALUATION_CACHE_TTL, max_entries=128)
+def _evaluate_cached(file_hash: str, _file_content: bytes, filename: str, eval_type_value: str, cache_version: int, proposal_context: tuple = (), _parsed=None) -> Dict[str, Any]:
+    """Run the evaluation for a document, memoized by content hash, evaluation type, code version and context.
+
+    ``_file_content`` and the background parse ``_parsed`` are excluded from Streamlit's cache key;
+    ``file_hash`` stands in for them. ``cache_version`` is ``_EVALUATION_CACHE_VERSION``, passed explicitly
+    because Streamlit only hashes the arguments a call supplies. ``proposal_context`` is the frozen form from
+    ``_freeze_context``, so a proposal is never served to a session with a different client or project
+    context. Unsuccessful results raise ``_EvaluationFailed`` and are never cached.
+    """
+    eval_type = EvaluationType(eval_type_value)
+    
+    # Parse once for every evaluation type; each handles a parse failure in its own way
+    try:
+        parsed_doc = _parse_document_cached(file_hash, _file_content, filename, _parsed)
+        parse_error = None
+    except Exception as e:
+        # The SOW and proposal paths may carry on with the raw text, so make the failure visible in the server log
+        logger.warning("Could not parse %s: %s", filename, e)
+        parsed_doc = None
+        parse_error = e
     
-    /* Alert message fixes */
-    .stAlert {
-        color: inherit !important;
-    }
+    if eval_type == EvaluationType.MIGRATION_PROPOSAL:
+        # Without a parsed document the orchestrator parses again and reports the failure
+        result = _track_progress(_get_eval_orchestrator().iter_evaluate(_file_content, filename, parsed_doc))
     
-    .stAlert > div {
-        color: inherit !important;
-    }
-</style>
-""", unsafe_allow_html=True)
+    elif eval_type == EvaluationType.STATEMENT_OF_WORK:
+        result = _evaluate_sow(_file_content, parsed_doc, parse_error)
+    
+    elif eval_type == EvaluationType.PROPOSAL_GENERATOR:
+        context = {key: list(value) if isinstance(value, tuple) else value for key, value in proposal_context}
+        result = _track_progress(_iter_generate_proposal(_file_content, filename, parsed_doc, context or None))
+    
+    else:
+        raise ValueError(f"Unsupported evaluation type: {eval_type_value}")
+    
+    if not result or not result.get("success"):
+        raise _EvaluationFailed(result or {"success": False, "error": "Evaluation returned no result"})
+    
+    if eval_type == EvaluationType.PROPOSAL_GENERATOR:
+        result = _proposal_outputs_result(result)
+    
+    return result
+
+
+def _evaluate_sow(file_content: bytes, parsed_doc, parse_error=None) -> Dict[str, Any]:
+    """Run the placeholder SOW evaluation."""
+    if parsed_doc is not None:
+        content = parsed_doc.content
+    elif file_content[:4] == b"%PDF":
+        # A PDF that failed to parse decodes to binary noise; report it rather than send it to the LLM
+        return {"success": False, "error": f"Could not parse PDF document: {str(parse_error)}"}
+    else:
+        # Fallback to basic content extraction
+        content = file_content[:8192].decode("utf-8", errors="ignore")
+    
+    from src.agents.sow_evaluator import evaluate_sow_document
+    
+    # Wrap SOW result in success format
+    return {"success": True, "evaluation_result": evaluate_sow_document(content)}
+
+
+def _iter_generate_proposal(file_content: bytes, filename: str, parsed_doc, proposal_context=None):
+    """Generate a migration proposal from discovery data, yielding progress events like ``iter_evaluate``."""
+    yield {"stage": "Initializing proposal generation...", "pct": 10}
+    
+    # Use the parsed document content as discovery data
+    if parsed_doc is not None:
+        content = parsed_doc.content
+    else:
+        # Fallback to basic content extraction; a 1 MB sample is plenty for discovery extraction
+        content = file_content[:1_000_000].decode('utf-8', errors='ignore')
+    
+    yield {"stage": "Analyzing discovery data...", "pct": 30}
+    
+    # Create discovery input data with context
+    if proposal_context:
+        discovery_data = {
+            "client_name": proposal_context.get("client_name", "Client Organization"),
+            "project_name": proposal_context.get("project_name", f"Migration Project - {filename}"),
+            "source_type": "text",
+            "raw_data": content,
+            "business_context": _build_business_context(proposal_context),
+            "target_cloud": proposal_context.get("target_cloud", "Not Specified"),
+            "migration_approach": proposal_context.get("migration_approach", "Not Specified"),
+            "timeline_constraint": proposal_context.get("timeline_constraint", "Not Specified"),
+            "budget_constraint": proposal_context.get("budget_constraint", "Not Specified"),
+            "risk_tolerance": proposal_context.get("risk_tolerance", "Not Specified"),
+            "compliance_requirements": proposal_context.get("compliance_requirements", [])
+        }
+    else:
+        # Fallback to default values
+        discovery_data = {
+            "client_name": "Client Organization",
+            "project_name": f"Migration Project - {filename}",
+            "source_type": "text",
+            "raw_data": content,
+            "business_context": "Cloud migration and modernization initiative"
+        }
+    
+    yield {"stage": "Generating migration proposal...", "pct": 50}
+    
+    # Initialize proposal generator
+    proposal_orchestrator = _get_proposal_orchestrator()
+    
+    yield {"stage": "Running proposal generation workflow...", "pct": 70}
+    
+    # Generate proposal
+    result = proposal_orchestrator.generate_proposal(discovery_data)
+    
+    yield {"stage": "Proposal generation complete!", "pct": 100, "result": result}
 
 
 def main():
     """Main application function."""
     
-    # Initialize session state for caching evaluation results
-    if 'evaluation_result' not in st.session_state:
-        st.session_state.evaluation_result = None
-    if 'evaluation_metadata' not in st.session_state:
-        st.session_state.evaluation_metadata = None
-    if 'last_file_hash' not in st.session_state:
-        st.session_state.last_file_hash = None
-    if 'last_eval_type' not in st.session_state:
-        st.session_state.last_eval_type = None
-    
     # Header
     st.markdown('<h1 class="main-header">Pre-Sales Document Evaluator</h1>', unsafe_allow_html=True)
     
@@ -166,26 +362,21 @@ def main():
         # Tool selector
         st.subheader("Select Evaluation Type")
         
-        # Create options for the selectbox
-        evaluation_options = {}
-        for eval_type, config in EVALUATION_CONFIGS.items():
-            evaluation_options[config.name] = eval_type
-        
         selected_option = st.selectbox(
             "Choose evaluation type:",
-            options=list(evaluation_options.keys()),
+            options=_EVALUATION_OPTION_NAMES,
             help="Select the type of document evaluation you want to perform"
         )
         
-        selected_eval_type = evaluation_options[selected_option]
+        selected_eval_type = _EVALUATION_OPTIONS[selected_option]
         selected_config = EVALUATION_CONFIGS[selected_eval_type]
+        config_info, config_criteria = _EVALUATION_INFO[selected_eval_type]
         
         # Display selected evaluation info
-        st.info(f"**{selected_config.name}**\n\n{selected_config.description}")
+        st.info(config_info)
         
         with st.expander("Evaluation Criteria"):
-            for criterion in selected_config.evaluation_criteria:
-                st.write(f"• {criterion}")
+            st.markdown(config_criteria)
         
         st.markdown("---")
         
@@ -206,8 +397,11 @@ def main():
         )
         
         if uploaded_file:
-            st.success(f"File uploaded: {uploaded_file.name}")
-            st.info(f"File size: {len(uploaded_file.getvalue())} bytes")
+            # The upload is an unmodified BytesIO, so getvalue() hands back its bytes without copying.
+            # Avoid getbuffer(): exporting a view forces BytesIO to take a private copy of the data.
+            file_bytes = uploaded_file.getvalue()
+            upload_prep = _start_upload_prep(uploaded_file, file_bytes)
+            st.success(f"File uploaded: {uploaded_file.name}\n\nFile size: {len(file_bytes)} bytes")
         
         # Additional context inputs for Proposal Generator
         proposal_context = {}
@@ -236,18 +430,7 @@ def main():
             st.markdown("**Business Drivers & Objectives**")
             business_drivers = st.multiselect(
                 "Primary drivers for migration:",
-                options=[
-                    "Cost Optimization",
-                    "Digital Transformation",
-                    "Scalability & Performance",
-                    "Security & Compliance",
-                    "Innovation & Agility",
-                    "Data Center Exit",
-                    "Disaster Recovery",
-                    "Modernization",
-                    "Competitive Advantage",
-                    "Regulatory Requirements"
-                ],
+                options=_BUSINESS_DRIVER_OPTIONS,
                 help="Select the main business drivers for this migration"
             )
             
@@ -263,14 +446,14 @@ def main():
             with col1:
                 target_cloud = st.selectbox(
                     "Primary Target Cloud",
-                    options=["AWS", "Microsoft Azure", "Google Cloud", "Multi-Cloud", "Hybrid", "Not Specified"],
+                    options=_TARGET_CLOUD_OPTIONS,
                     index=5,
                     help="Primary cloud platform for migration"
                 )
             with col2:
                 migration_approach = st.selectbox(
                     "Preferred Migration Approach",
-                    options=["Lift & Shift First", "Modernize Where Possible", "Cloud-Native Transformation", "Hybrid Approach", "Not Specified"],
+                    options=_MIGRATION_APPROACH_OPTIONS,
                     index=4,
                     help="Overall approach preference for migration"
                 )
@@ -281,14 +464,14 @@ def main():
             with col1:
                 timeline_constraint = st.selectbox(
                     "Timeline Urgency",
-                    options=["Flexible", "Moderate (6-12 months)", "Urgent (3-6 months)", "Critical (<3 months)", "Not Specified"],
+                    options=_TIMELINE_OPTIONS,
                     index=4,
                     help="Overall timeline expectations"
                 )
             with col2:
                 budget_constraint = st.selectbox(
                     "Budget Considerations",
-                    options=["Flexible", "Moderate Budget", "Cost-Conscious", "Minimal Budget", "Not Specified"],
+                    options=_BUDGET_OPTIONS,
                     index=4,
                     help="Budget constraints for the project"
                 )
@@ -299,14 +482,14 @@ def main():
             with col1:
                 risk_tolerance = st.selectbox(
                     "Risk Tolerance",
-                    options=["Conservative", "Moderate", "Aggressive", "Not Specified"],
+                    options=_RISK_TOLERANCE_OPTIONS,
                     index=3,
                     help="Organization's tolerance for migration risks"
                 )
             with col2:
                 compliance_requirements = st.multiselect(
                     "Compliance Requirements",
-                    options=["GDPR", "HIPAA", "SOX", "PCI-DSS", "ISO 27001", "FedRAMP", "SOC 2", "None", "Other"],
+                    options=_COMPLIANCE_OPTIONS,
                     help="Relevant compliance frameworks"
                 )
             
@@ -326,221 +509,97 @@ def main():
         
         st.markdown("---")
         
-        # Evaluation options (only show if file is uploaded)
+        # Re-run option (only show if file is uploaded)
         if uploaded_file:
-            st.subheader("Display Options")
-            show_detailed_analysis = st.checkbox("Show detailed analysis", value=True)
-            show_phase_breakdown = st.checkbox("Show phase breakdown", value=True)
-            show_recommendations = st.checkbox("Show recommendations", value=True)
-            
-            st.markdown("---")
-            
-            # Add re-run button
             if st.button("Re-run Evaluation", help="Force re-evaluation of the document"):
-                # Clear cache to force re-evaluation
-                st.session_state.evaluation_result = None
-                st.session_state.last_file_hash = None
-                st.session_state.last_eval_type = None
-                st.rerun()
-        else:
-            show_detailed_analysis = True
-            show_phase_breakdown = True
-            show_recommendations = True
+                # Clear this document's cached result; the evaluation further down this run then misses the cache
+                _evaluate_cached.clear(
+                    upload_prep["hash"], None, uploaded_file.name, selected_eval_type.value, _EVALUATION_CACHE_VERSION,
+                    _freeze_context(proposal_context)
+                )
     
     # Main content area - only show evaluation if file is uploaded
     if uploaded_file is not None:
-        run_evaluation_with_cache(uploaded_file, selected_eval_type, selected_config, show_detailed_analysis, show_phase_breakdown, show_recommendations, proposal_context)
+        run_evaluation_with_cache(
+            file_bytes, uploaded_file.name, upload_prep["hash"], selected_eval_type, selected_config,
+            proposal_context, upload_prep["parsed"]
+        )
     else:
-        # Clear cached results when no file is uploaded
-        if st.session_state.evaluation_result is not None:
-            st.session_state.evaluation_result = None
-            st.session_state.evaluation_metadata = None
-            st.session_state.last_file_hash = None
-            st.session_state.last_eval_type = None
-        
         # Blank right pane with just a simple message
         st.markdown("### Upload a document to begin evaluation")
         st.markdown("Select an evaluation type from the sidebar and upload your document to get started.")
 
 
-def run_evaluation_with_cache(uploaded_file, eval_type, config, show_detailed_analysis, show_phase_breakdown, show_recommendations, proposal_context=None):
+def run_evaluation_with_cache(file_content: bytes, filename: str, file_hash: str, eval_type, config, proposal_context=None, parsed=None):
     """Run evaluation with caching to avoid re-running on display option changes."""
     
-    # Create a hash of the file content to detect changes
-    import hashlib
-    file_content = uploaded_file.getvalue()
-    file_hash = hashlib.md5(file_content).hexdigest()
+    st.subheader(f"{config.name}: {filename}")
     
-    # Check if we need to re-run the evaluation
-    need_evaluation = (
-        st.session_state.evaluation_result is None or
-        st.session_state.last_file_hash != file_hash or
-        st.session_state.last_eval_type != eval_type
-    )
+    # Served from the on-disk cache unless this file and evaluation type are new
+    result = run_evaluation_core(file_content, filename, eval_type, config, proposal_context, file_hash, parsed)
     
-    if need_evaluation:
-        # Show that we're running a new evaluation
-        st.subheader(f"{config.name}: {uploaded_file.name}")
-        
-        # Run the actual evaluation
-        result = run_evaluation_core(uploaded_file, eval_type, config, proposal_context)
-        
-        # Cache the results
-        if result and result.get("success"):
-            st.session_state.evaluation_result = result
-            st.session_state.last_file_hash = file_hash
-            st.session_state.last_eval_type = eval_type
-        else:
-            # Don't cache failed results
-            st.session_state.evaluation_result = None
-            if result:
-                st.error(f"Evaluation failed: {result.get('error', 'Unknown error')}")
-                if result.get("partial_results"):
-                    st.subheader("Partial Results")
-                    st.json(result["partial_results"])
-            return
-    else:
-        # Using cached results - show a subtle indicator
-        st.subheader(f"{config.name}: {uploaded_file.name}")
-        st.caption("Using cached evaluation results (change file or evaluation type to re-run)")
+    if not result or not result.get("success"):
+        if result:
+            st.error(f"Evaluation failed: {result.get('error', 'Unknown error')}")
+            if result.get("partial_results"):
+                st.subheader("Partial Results")
+                st.json(result["partial_results"])
+        return
     
-    # Display results (either fresh or cached)
-    if st.session_state.evaluation_result:
-        result = st.session_state.evaluation_result
-        
-        if eval_type == EvaluationType.MIGRATION_PROPOSAL:
-            display_evaluation_results(result, show_detailed_analysis, show_phase_breakdown, show_recommendations)
-        elif eval_type == EvaluationType.STATEMENT_OF_WORK:
-            display_sow_results(result, show_detailed_analysis, show_phase_breakdown, show_recommendations)
-        elif eval_type == EvaluationType.PROPOSAL_GENERATOR:
-            display_proposal_generator_results(result, show_detailed_analysis, show_phase_breakdown, show_recommendations)
+    _display_results(result, eval_type)
 
 
-def run_evaluation_core(uploaded_file, eval_type, config, proposal_context=None):
-    """Core evaluation logic without caching."""
+@st.fragment
+def _display_results(result: Dict[str, Any], eval_type):
+    """Render the results pane; its own widgets rerun only this fragment, not the upload and evaluation path."""
     
-    # Create progress bar
-    progress_bar = st.progress(0)
-    status_text = st.empty()
+    # Display options live in the fragment so toggling them re-renders just the results
+    col1, col2, col3 = st.columns(3)
+    show_detailed_analysis = col1.checkbox("Show detailed analysis", value=True)
+    show_phase_breakdown = col2.checkbox("Show phase breakdown", value=True)
+    show_recommendations = col3.checkbox("Show recommendations", value=True)
+    
+    if eval_type == EvaluationType.MIGRATION_PROPOSAL:
+        display_evaluation_results(result, show_detailed_analysis, show_phase_breakdown, show_recommendations)
+    elif eval_type == EvaluationType.STATEMENT_OF_WORK:
+        display_sow_results(result, show_detailed_analysis, show_phase_breakdown, show_recommendations)
+    elif eval_type == EvaluationType.PROPOSAL_GENERATOR:
+        display_proposal_generator_results(result, show_detailed_analysis, show_phase_breakdown, show_recommendations)
+
+
+def run_evaluation_core(file_content: bytes, filename: str, eval_type, config, proposal_context=None, file_hash=None, parsed=None):
+    """Core evaluation logic; successful results are memoized per file hash by ``_evaluate_cached``."""
     
     try:
-        # Get file content
-        file_content = uploaded_file.getvalue()
-        
         if not file_content:
             st.error("No file content detected!")
             return None
         
-        # Route to appropriate evaluator based on type
-        if eval_type == EvaluationType.MIGRATION_PROPOSAL:
-            # Use existing migration proposal evaluator
-            status_text.text("Initializing migration proposal evaluation...")
-            progress_bar.progress(10)
-            
-            orchestrator = EvaluationOrchestrator()
-            
-            status_text.text("Analyzing migration proposal...")
-            progress_bar.progress(30)
-            
-            result = orchestrator.evaluate_document(file_content, uploaded_file.name)
-            
-            progress_bar.progress(100)
-            status_text.text("Migration evaluation complete!")
-            
-            return result
-        
-        elif eval_type == EvaluationType.STATEMENT_OF_WORK:
-            # Use placeholder SOW evaluator
-            status_text.text("Initializing SOW evaluation framework...")
-            progress_bar.progress(10)
-            
-            status_text.text("Running placeholder SOW analysis...")
-            progress_bar.progress(50)
-            
-            # Parse document content (basic parsing for now)
-            try:
-                from src.utils.document_parser import DocumentParser
-                parsed_doc = DocumentParser.parse_document(file_content, uploaded_file.name)
-                content = parsed_doc.content
-            except Exception:
-                # Fallback to basic content extraction
-                content = str(file_content[:1000])  # Simple fallback
-            
-            result = evaluate_sow_document(content)
-            
-            progress_bar.progress(100)
-            status_text.text("SOW framework evaluation complete!")
-            
-            # Wrap SOW result in success format
-            return {"success": True, "evaluation_result": result}
+        if file_hash is None:
+            file_hash = _hash_bytes(file_content)
         
-        elif eval_type == EvaluationType.PROPOSAL_GENERATOR:
-            # Use proposal generator
-            status_text.text("Initializing proposal generation...")
-            progress_bar.progress(10)
-            
-            # Parse document content as discovery data
-            try:
-                from src.utils.document_parser import DocumentParser
-                parsed_doc = DocumentParser.parse_document(file_content, uploaded_file.name)
-                content = parsed_doc.content
-            except Exception:
-                # Fallback to basic content extraction
-                content = str(file_content, 'utf-8', errors='ignore')
-            
-            status_text.text("Analyzing discovery data...")
-            progress_bar.progress(30)
-            
-            # Create discovery input data with context
-            if proposal_context:
-                discovery_data = {
-                    "client_name": proposal_context.get("client_name", "Client Organization"),
-                    "project_name": proposal_context.get("project_name", f"Migration Project - {uploaded_file.name}"),
-                    "source_type": "text",
-                    "raw_data": content,
-                    "business_context": _build_business_context(proposal_context),
-                    "target_cloud": proposal_context.get("target_cloud", "Not Specified"),
-                    "migration_approach": proposal_context.get("migration_approach", "Not Specified"),
-                    "timeline_constraint": proposal_context.get("timeline_constraint", "Not Specified"),
-                    "budget_constraint": proposal_context.get("budget_constraint", "Not Specified"),
-                    "risk_tolerance": proposal_context.get("risk_tolerance", "Not Specified"),
-                    "compliance_requirements": proposal_context.get("compliance_requirements", [])
-                }
-            else:
-                # Fallback to default values
-                discovery_data = {
-                    "client_name": "Client Organization",
-                    "project_name": f"Migration Project - {uploaded_file.name}",
-                    "source_type": "text",
-                    "raw_data": content,
-                    "business_context": "Cloud migration and modernization initiative"
-                }
-            
-            status_text.text("Generating migration proposal...")
-            progress_bar.progress(50)
-            
-            # Initialize proposal generator
-            proposal_orchestrator = ProposalGenerationOrchestrator()
-            
-            status_text.text("Running proposal generation workflow...")
-            progress_bar.progress(70)
-            
-            # Generate proposal
-            result = proposal_orchestrator.generate_proposal(discovery_data)
-            
-            progress_bar.progress(100)
-            status_text.text("Proposal generation complete!")
-            
-            return result
+        try:
+            return _evaluate_cached(
+                file_hash, file_content, filename, eval_type.value, _EVALUATION_CACHE_VERSION,
+                _freeze_context(proposal_context), parsed
+            )
+        except _EvaluationFailed as e:
+            return e.result
                 
     except Exception as e:
         st.error(f"An error occurred: {str(e)}")
-        import traceback
         st.code(traceback.format_exc())
         return {"success": False, "error": str(e)}
-    finally:
-        progress_bar.empty()
-        status_text.empty()
+
+
+# Single-choice context fields in the order they appear in the business context; "Not Specified" is omitted
+_CONTEXT_CHOICE_LABELS = (
+    ("target_cloud", "Target cloud platform"),
+    ("migration_approach", "Preferred migration approach"),
+    ("timeline_constraint", "Timeline expectations"),
+    ("budget_constraint", "Budget considerations"),
+    ("risk_tolerance", "Risk tolerance"),
+)
 
 
 def _build_business_context(proposal_context):
@@ -557,29 +616,14 @@ def _build_business_context(proposal_context):
     if additional:
         context_parts.append(f"Additional context: {additional}")
     
-    # Target environment
-    target_cloud = proposal_context.get("target_cloud", "Not Specified")
-    if target_cloud != "Not Specified":
-        context_parts.append(f"Target cloud platform: {target_cloud}")
-    
-    migration_approach = proposal_context.get("migration_approach", "Not Specified")
-    if migration_approach != "Not Specified":
-        context_parts.append(f"Preferred migration approach: {migration_approach}")
-    
-    # Timeline and budget
-    timeline = proposal_context.get("timeline_constraint", "Not Specified")
-    if timeline != "Not Specified":
-        context_parts.append(f"Timeline expectations: {timeline}")
-    
-    budget = proposal_context.get("budget_constraint", "Not Specified")
-    if budget != "Not Specified":
-        context_parts.append(f"Budget considerations: {budget}")
-    
-    # Risk and compliance
-    risk_tolerance = proposal_context.get("risk_tolerance", "Not Specified")
-    if risk_tolerance != "Not Specified":
-        context_parts.append(f"Risk tolerance: {risk_tolerance}")
+    # Target environment, timeline, budget and risk selections
+    context_parts.extend(
+        f"{label}: {value}"
+        for key, label in _CONTEXT_CHOICE_LABELS
+        if (value := proposal_context.get(key, "Not Specified")) != "Not Specified"
+    )
     
+    # Compliance
     compliance = proposal_context.get("compliance_requirements", [])
     if compliance and compliance != ["None"]:
         context_parts.append(f"Compliance requirements: {', '.join(compliance)}")
@@ -591,52 +635,165 @@ def _build_business_context(proposal_context):
         return "Cloud migration and modernization initiative."
 
 
+def _metric_row(metrics):
+    """Render (label, value[, delta[, help]]) metrics as one HTML grid instead of a column container per metric.
+
+    ``help`` becomes the cell's hover tooltip, like ``st.metric(help=...)``.
+    """
+    cells = "".join(
+        f'<div class="metric-container"{_title_attr(extra[1] if len(extra) > 1 else None)}>'
+        f'<div>{html.escape(str(label))}</div>'
+        f'<div style="font-size:1.8rem">{html.escape(str(value))}</div>'
+        f'{f"<div>{html.escape(str(extra[0]))}</div>" if extra and extra[0] is not None else ""}</div>'
+        for label, value, *extra in metrics
+    )
+    st.markdown(
+        f'<div style="display:grid;grid-template-columns:repeat({len(metrics)},1fr);gap:1rem">{cells}</div>',
+        unsafe_allow_html=True
+    )
+
+
+def _title_attr(text) -> str:
+    """HTML title attribute for a tooltip, or nothing when there is no text."""
+    return f' title="{html.escape(text)}"' if text else ""
+
+
+_LEVELS = ("critical", "high", "medium", "low")
+
+
+def _group_by_level(items, attr: str):
+    """Split items into critical, high, medium and low lists by ``attr`` in a single pass."""
+    get_level = attrgetter(attr)
+    groups = defaultdict(list)
+    for item in items:
+        groups[get_level(item)].append(item)
+    return tuple(groups[level] for level in _LEVELS)
+
+
+def _bullet_list(heading: str, items) -> str:
+    """Heading followed by one bullet paragraph per item, sent as a single markdown element."""
+    return "\n\n".join(chain((heading,), (f"• {item}" for item in items)))
+
+
+def _gap_cards_html(gaps, css_class: str) -> str:
+    """Render a group of gaps as one HTML block so they go out in a single Streamlit message."""
+    return "\n".join(
+        f'<div class="{css_class}"><strong>{html.escape(gap.area)}</strong><br>'
+        f'{html.escape(gap.description)}<br>'
+        f'<em>Impact: {html.escape(gap.impact)}</em></div>'
+        for gap in gaps
+    )
+
+
+def _recommendation_cards_html(recs) -> str:
+    """Render a group of recommendations as one HTML block so they go out in a single Streamlit message."""
+    return "\n".join(
+        f'<div class="recommendation"><strong>{html.escape(rec.title)}'
+        f'{f" ({rec.phase.value})" if rec.phase else ""}</strong><br>'
+        f'{html.escape(rec.description)}<br>'
+        f'<em>Implementation effort: {html.escape(rec.implementation_effort)}</em></div>'
+        for rec in recs
+    )
+
+
+# Chart layouts shared by every render
+_PHASE_SCORES_LAYOUT = {
+    "title": "Migration Phase Scores (0-3 scale)",
+    "yaxis": {"range": [0, 3]},
+    "height": 400
+}
+_SOW_PHASES_LAYOUT = {"height": 400}
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _phase_scores_figure(phase_names: tuple, phase_scores: tuple):
+    """Build the phase score bar chart, memoized so display-option reruns reuse the figure."""
+    import numpy as np
+    import plotly.graph_objects as go
+    
+    scores = np.fromiter(phase_scores, dtype=float, count=len(phase_scores))
+    colors = np.select([scores < 1.5, scores < 2.5], ['#ff4444', '#ffaa00'], default='#44ff44')
+    
+    fig = go.Figure(data=[
+        go.Bar(
+            x=phase_names,
+            y=scores,
+            marker_color=colors,
+            text=scores,
+            textposition='auto',
+        )
+    ])
+    
+    fig.update_layout(**_PHASE_SCORES_LAYOUT)
+    
+    return fig
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _sow_phases_figure(phase_names: tuple, phase_scores: tuple):
+    """Build the SOW framework phase chart, memoized on the phase names and scores."""
+    import numpy as np
+    import pandas as pd
+    import plotly.express as px
+    
+    scores = np.fromiter(phase_scores, dtype=np.float32, count=len(phase_scores))
+    phase_data = pd.DataFrame({
+        'Phase': phase_names,
+        'Score': scores,
+        'Max Score': 3,
+        'Percentage': scores / 3 * 100
+    })
+    
+    fig = px.bar(
+        phase_data, 
+        x='Phase', 
+        y='Percentage',
+        title='SOW Framework Phase Structure (Placeholder Data)',
+        color='Percentage',
+        color_continuous_scale='Blues',
+        range_color=[0, 100]
+    )
+    fig.update_layout(**_SOW_PHASES_LAYOUT)
+    
+    return fig
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _strategy_pie_figure(strategy_names: tuple, strategy_counts: tuple):
+    """Build the migration strategy distribution pie, memoized on the strategy counts."""
+    import plotly.express as px
+    
+    return px.pie(
+        values=strategy_counts,
+        names=strategy_names,
+        title="Migration Strategy Distribution"
+    )
+
+
 def display_evaluation_results(result: Dict[str, Any], show_detailed: bool, show_phases: bool, show_recs: bool):
     """Display the evaluation results."""
     
     evaluation = result["evaluation_result"]
-    metadata = result["metadata"]
     
     # Overall summary
     st.subheader("Evaluation Summary")
     
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        st.metric("Overall Score", f"{evaluation.overall_score:.1f}/3.0")
-    
-    with col2:
-        compliance_pct = evaluation.spec_compliance.overall_compliance_score * 100
-        st.metric("Compliance", f"{compliance_pct:.0f}%")
-    
-    with col3:
-        st.metric("Gaps Identified", len(evaluation.gaps))
-    
-    with col4:
-        st.metric("Recommendations", len(evaluation.recommendations))
+    compliance_pct = evaluation.spec_compliance.overall_compliance_score * 100
+    _metric_row([
+        ("Overall Score", f"{evaluation.overall_score:.1f}/3.0"),
+        ("Compliance", f"{compliance_pct:.0f}%"),
+        ("Gaps Identified", len(evaluation.gaps)),
+        ("Recommendations", len(evaluation.recommendations))
+    ])
     
     # Phase scores visualization
     if show_phases:
         st.subheader("Phase Scores")
         
         # Create phase scores chart
-        phases = list(evaluation.scorecard.keys())
-        scores = list(evaluation.scorecard.values())
-        
-        fig = go.Figure(data=[
-            go.Bar(
-                x=[phase.value.title() for phase in phases],
-                y=scores,
-                marker_color=['#ff4444' if s < 1.5 else '#ffaa00' if s < 2.5 else '#44ff44' for s in scores],
-                text=scores,
-                textposition='auto',
-            )
-        ])
-        
-        fig.update_layout(
-            title="Migration Phase Scores (0-3 scale)",
-            yaxis=dict(range=[0, 3]),
-            height=400
+        fig = _phase_scores_figure(
+            tuple(phase.value.title() for phase in evaluation.scorecard),
+            tuple(evaluation.scorecard.values())
         )
         
         st.plotly_chart(fig, use_container_width=True)
@@ -647,101 +804,57 @@ def display_evaluation_results(result: Dict[str, Any], show_detailed: bool, show
                 col1, col2 = st.columns(2)
                 
                 with col1:
-                    st.markdown("**Strengths:**")
-                    for strength in phase_eval.strengths:
-                        st.markdown(f"• {strength}")
+                    st.markdown(_bullet_list("**Strengths:**", phase_eval.strengths))
                 
                 with col2:
-                    st.markdown("**Areas for Improvement:**")
-                    for weakness in phase_eval.weaknesses:
-                        st.markdown(f"• {weakness}")
+                    st.markdown(_bullet_list("**Areas for Improvement:**", phase_eval.weaknesses))
                 
                 if phase_eval.evidence:
-                    st.markdown("**Evidence:**")
-                    for evidence in phase_eval.evidence:
-                        st.markdown(f"• {evidence}")
+                    st.markdown(_bullet_list("**Evidence:**", phase_eval.evidence))
     
     # Gaps analysis
     if evaluation.gaps:
         st.subheader("Gap Analysis")
         
-        # Group gaps by severity
-        critical_gaps = [g for g in evaluation.gaps if g.severity == "critical"]
-        high_gaps = [g for g in evaluation.gaps if g.severity == "high"]
-        medium_gaps = [g for g in evaluation.gaps if g.severity == "medium"]
-        low_gaps = [g for g in evaluation.gaps if g.severity == "low"]
+        critical_gaps, high_gaps, medium_gaps, low_gaps = _group_by_level(evaluation.gaps, "severity")
         
         if critical_gaps:
-            st.markdown("### Critical Gaps")
-            for gap in critical_gaps:
-                st.markdown(f"""
-                <div class="critical-gap">
-                    <strong>{gap.area}</strong><br>
-                    {gap.description}<br>
-                    <em>Impact: {gap.impact}</em>
-                </div>
-                """, unsafe_allow_html=True)
+            st.markdown(f"### Critical Gaps\n\n{_gap_cards_html(critical_gaps, 'critical-gap')}", unsafe_allow_html=True)
         
         if high_gaps:
-            st.markdown("### High Priority Gaps")
-            for gap in high_gaps:
-                st.markdown(f"""
-                <div class="high-gap">
-                    <strong>{gap.area}</strong><br>
-                    {gap.description}<br>
-                    <em>Impact: {gap.impact}</em>
-                </div>
-                """, unsafe_allow_html=True)
+            st.markdown(f"### High Priority Gaps\n\n{_gap_cards_html(high_gaps, 'high-gap')}", unsafe_allow_html=True)
         
         # Show medium and low gaps in expander
         if medium_gaps or low_gaps:
-            with st.expander(f"Other Gaps ({len(medium_gaps + low_gaps)} items)"):
-                for gap in medium_gaps + low_gaps:
-                    st.markdown(f"**{gap.area}** ({gap.severity}): {gap.description}")
+            with st.expander(f"Other Gaps ({len(medium_gaps) + len(low_gaps)} items)"):
+                st.markdown("\n\n".join(
+                    f"**{gap.area}** ({gap.severity}): {gap.description}"
+                    for gap in chain(medium_gaps, low_gaps)
+                ))
     
     # Recommendations
     if show_recs and evaluation.recommendations:
         st.subheader("Recommendations")
         
-        # Group recommendations by priority
-        critical_recs = [r for r in evaluation.recommendations if r.priority == "critical"]
-        high_recs = [r for r in evaluation.recommendations if r.priority == "high"]
-        medium_recs = [r for r in evaluation.recommendations if r.priority == "medium"]
-        low_recs = [r for r in evaluation.recommendations if r.priority == "low"]
+        critical_recs, high_recs, medium_recs, low_recs = _group_by_level(evaluation.recommendations, "priority")
         
         if critical_recs:
-            st.markdown("### Critical Recommendations")
-            for rec in critical_recs:
-                phase_str = f" ({rec.phase.value})" if rec.phase else ""
-                st.markdown(f"""
-                <div class="recommendation">
-                    <strong>{rec.title}{phase_str}</strong><br>
-                    {rec.description}<br>
-                    <em>Implementation effort: {rec.implementation_effort}</em>
-                </div>
-                """, unsafe_allow_html=True)
+            st.markdown(f"### Critical Recommendations\n\n{_recommendation_cards_html(critical_recs)}", unsafe_allow_html=True)
         
         if high_recs:
-            st.markdown("### High Priority Recommendations")
-            for rec in high_recs:
-                phase_str = f" ({rec.phase.value})" if rec.phase else ""
-                st.markdown(f"""
-                <div class="recommendation">
-                    <strong>{rec.title}{phase_str}</strong><br>
-                    {rec.description}<br>
-                    <em>Implementation effort: {rec.implementation_effort}</em>
-                </div>
-                """, unsafe_allow_html=True)
+            st.markdown(f"### High Priority Recommendations\n\n{_recommendation_cards_html(high_recs)}", unsafe_allow_html=True)
         
         # Show other recommendations in expander
         if medium_recs or low_recs:
-            with st.expander(f"Additional Recommendations ({len(medium_recs + low_recs)} items)"):
-                for rec in medium_recs + low_recs:
-                    phase_str = f" ({rec.phase.value})" if rec.phase else ""
-                    st.markdown(f"**{rec.title}{phase_str}** ({rec.priority}): {rec.description}")
+            with st.expander(f"Additional Recommendations ({len(medium_recs) + len(low_recs)} items)"):
+                st.markdown("\n\n".join(
+                    f"**{rec.title}{f' ({rec.phase.value})' if rec.phase else ''}** ({rec.priority}): {rec.description}"
+                    for rec in chain(medium_recs, low_recs)
+                ))
     
     # Detailed analysis
     if show_detailed:
+        metadata = result["metadata"]
         with st.expander("Detailed Analysis"):
             st.markdown("### Document Information")
             st.json(metadata["document_info"])
@@ -757,31 +870,35 @@ def display_evaluation_results(result: Dict[str, Any], show_detailed: bool, show
     # Export options
     st.subheader("Export Results")
     
+    # Exports are generated only when a download is clicked, on a worker thread off the script run
+    filename = result["metadata"]["document_info"]["filename"]
     col1, col2 = st.columns(2)
     
     with col1:
-        if st.button("Export as YAML"):
-            yaml_output = create_yaml_export(evaluation)
-            st.download_button(
-                label="Download YAML Report",
-                data=yaml_output,
-                file_name=f"evaluation_report_{uploaded_file.name}.yaml",
-                mime="text/yaml"
-            )
+        st.download_button(
+            label="Download YAML Report",
+            data=lambda: create_yaml_export(evaluation),
+            file_name=f"evaluation_report_{filename}.yaml",
+            mime="text/yaml",
+            on_click="ignore"
+        )
     
     with col2:
-        if st.button("Export as JSON"):
-            import json
-            json_output = json.dumps(result, default=str, indent=2)
-            st.download_button(
-                label="Download JSON Report",
-                data=json_output,
-                file_name=f"evaluation_report_{uploaded_file.name}.json",
-                mime="application/json"
-            )
+        st.download_button(
+            label="Download JSON Report",
+            data=lambda: _dump_json(result),
+            file_name=f"evaluation_report_{filename}.json",
+            mime="application/json",
+            on_click="ignore"
+        )
 
 
-def create_yaml_export(evaluation) -> str:
+# Serialize whole gap/recommendation lists in pydantic-core; mode="json" turns phases into their values
+_GAPS_ADAPTER = TypeAdapter(List[Gap])
+_RECOMMENDATIONS_ADAPTER = TypeAdapter(List[Recommendation])
+
+
+def create_yaml_export(evaluation) -> bytes:
     """Create YAML export of evaluation results."""
     
     export_data = {
@@ -796,30 +913,39 @@ def create_yaml_export(evaluation) -> str:
                 "non_compliant_areas": evaluation.spec_compliance.non_compliant_areas,
                 "missing_elements": evaluation.spec_compliance.missing_elements
             },
-            "gaps": [
-                {
-                    "area": gap.area,
-                    "severity": gap.severity,
-                    "description": gap.description,
-                    "impact": gap.impact,
-                    "phase": gap.phase.value if gap.phase else None
-                }
-                for gap in evaluation.gaps
-            ],
-            "recommendations": [
-                {
-                    "title": rec.title,
-                    "description": rec.description,
-                    "priority": rec.priority,
-                    "phase": rec.phase.value if rec.phase else None,
-                    "implementation_effort": rec.implementation_effort
-                }
-                for rec in evaluation.recommendations
-            ]
+            "gaps": _GAPS_ADAPTER.dump_python(evaluation.gaps, mode="json"),
+            "recommendations": _RECOMMENDATIONS_ADAPTER.dump_python(evaluation.recommendations, mode="json")
         }
     }
     
-    return yaml.dump(export_data, default_flow_style=False, sort_keys=False)
+    return _dump_yaml(export_data)
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _dump_yaml(export_data: Dict[str, Any]) -> bytes:
+    """Serialize an export payload to UTF-8 YAML bytes, memoized on the payload's content."""
+    return yaml.dump(export_data, Dumper=YamlDumper, encoding="utf-8", default_flow_style=False, sort_keys=False)
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _dump_json(export_data: Dict[str, Any]) -> bytes:
+    """Serialize an export payload to indented UTF-8 JSON, memoized on the payload's content.
+
+    Returns bytes, which ``st.download_button`` sends as-is instead of re-encoding a str.
+    """
+    return orjson.dumps(
+        export_data,
+        default=str,
+        option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+    )
+
+
+def _model_json_default(obj):
+    """orjson fallback that dumps pydantic models in pydantic-core and stringifies anything else."""
+    model_dump = getattr(obj, "model_dump", None)
+    if model_dump is not None:
+        return model_dump(mode="json")
+    return str(obj)
 
 
 def display_sow_results(result, show_detailed_analysis, show_phase_breakdown, show_recommendations):
@@ -833,41 +959,21 @@ def display_sow_results(result, show_detailed_analysis, show_phase_breakdown, sh
     max_score = result.get('max_score', 9)  # 3 phases * 3 max score each
     percentage = (overall_score / max_score) * 100 if max_score > 0 else 0
     
-    col1, col2, col3 = st.columns(3)
-    
-    with col1:
-        st.metric("Framework Score", f"{overall_score}/{max_score}", f"{percentage:.1f}%")
-    
-    with col2:
-        st.metric("Status", "Framework Ready")
-    
-    with col3:
-        st.metric("Phases Configured", len(result.get('phase_results', {})))
+    _metric_row([
+        ("Framework Score", f"{overall_score}/{max_score}", f"{percentage:.1f}%"),
+        ("Status", "Framework Ready"),
+        ("Phases Configured", len(result.get('phase_results', {})))
+    ])
     
     # Phase Breakdown
     if show_phase_breakdown and result.get('phase_results'):
         st.subheader("Framework Phase Structure")
         
-        phase_data = []
-        for phase_name, phase_result in result['phase_results'].items():
-            phase_data.append({
-                'Phase': phase_name.replace('_', ' ').title(),
-                'Score': phase_result.get('score', 0),
-                'Max Score': 3,
-                'Percentage': (phase_result.get('score', 0) / 3) * 100
-            })
-        
-        # Create bar chart
-        fig = px.bar(
-            phase_data, 
-            x='Phase', 
-            y='Percentage',
-            title='SOW Framework Phase Structure (Placeholder Data)',
-            color='Percentage',
-            color_continuous_scale='Blues',
-            range_color=[0, 100]
+        phase_results = result['phase_results']
+        fig = _sow_phases_figure(
+            tuple(phase_name.replace('_', ' ').title() for phase_name in phase_results),
+            tuple(phase_result.get('score', 0) for phase_result in phase_results.values())
         )
-        fig.update_layout(height=400)
         st.plotly_chart(fig, use_container_width=True)
         
         # Detailed phase results
@@ -883,34 +989,28 @@ def display_sow_results(result, show_detailed_analysis, show_phase_breakdown, sh
                     st.metric("Readiness", f"{phase_percentage:.1f}%")
                 
                 if phase_result.get('feedback'):
-                    st.markdown("**Framework Status:**")
-                    st.markdown(phase_result['feedback'])
+                    st.markdown(f"**Framework Status:**\n\n{phase_result['feedback']}")
                 
                 if phase_result.get('strengths'):
-                    st.markdown("**Framework Strengths:**")
-                    for strength in phase_result['strengths']:
-                        st.markdown(f"• {strength}")
+                    st.markdown(_bullet_list("**Framework Strengths:**", phase_result['strengths']))
                 
                 if phase_result.get('gaps'):
-                    st.markdown("**Implementation Needed:**")
-                    for gap in phase_result['gaps']:
-                        st.markdown(f"• {gap}")
+                    st.markdown(_bullet_list("**Implementation Needed:**", phase_result['gaps']))
     
     # Key Findings
     if show_detailed_analysis and result.get('key_findings'):
         st.subheader("Framework Status")
         
-        st.markdown("**Current State:**")
-        for finding in result['key_findings']:
-            st.markdown(f"• {finding}")
+        st.markdown(_bullet_list("**Current State:**", result['key_findings']))
     
     # Recommendations
     if show_recommendations and result.get('recommendations'):
         st.subheader("Implementation Roadmap")
         
+        roadmap = []
         for i, recommendation in enumerate(result['recommendations'], 1):
-            st.markdown(f"**{i}. {recommendation.get('title', 'Recommendation')}**")
-            st.markdown(recommendation.get('description', ''))
+            roadmap.append(f"**{i}. {recommendation.get('title', 'Recommendation')}**")
+            roadmap.append(recommendation.get('description', ''))
             
             if recommendation.get('priority'):
                 priority_color = {
@@ -918,34 +1018,36 @@ def display_sow_results(result, show_detailed_analysis, show_phase_breakdown, sh
                     'Medium': 'Medium', 
                     'Low': 'Low'
                 }.get(recommendation['priority'], 'Unknown')
-                st.markdown(f"Priority: {priority_color}")
+                roadmap.append(f"Priority: {priority_color}")
             
-            st.markdown("---")
+            roadmap.append("---")
+        
+        # One element for the whole roadmap rather than several per recommendation
+        st.markdown("\n\n".join(roadmap))
     
     # Export Options
     st.subheader("Framework Export")
     
+    ts = datetime.now().strftime('%Y%m%d_%H%M%S')
     col1, col2 = st.columns(2)
     
     with col1:
-        if st.button("Export Framework as YAML"):
-            yaml_content = create_sow_yaml_export(result)
-            st.download_button(
-                label="Download Framework Report",
-                data=yaml_content,
-                file_name=f"sow_framework_{datetime.now().strftime('%Y%m%d_%H%M%S')}.yaml",
-                mime="text/yaml"
-            )
+        st.download_button(
+            label="Download Framework Report",
+            data=lambda: create_sow_yaml_export(result),
+            file_name=f"sow_framework_{ts}.yaml",
+            mime="text/yaml",
+            on_click="ignore"
+        )
     
     with col2:
-        if st.button("Export Framework Summary"):
-            summary = create_sow_summary_export(result)
-            st.download_button(
-                label="Download Framework Summary",
-                data=summary,
-                file_name=f"sow_framework_summary_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt",
-                mime="text/plain"
-            )
+        st.download_button(
+            label="Download Framework Summary",
+            data=lambda: create_sow_summary_export(result),
+            file_name=f"sow_framework_summary_{ts}.txt",
+            mime="text/plain",
+            on_click="ignore"
+        )
 
 
 def create_sow_yaml_export(result):
@@ -963,7 +1065,12 @@ def create_sow_yaml_export(result):
             'quality_indicators': result.get('quality_indicators', {})
         }
     }
-    return yaml.dump(export_data, default_flow_style=False, sort_keys=False)
+    return yaml.dump(export_data, Dumper=YamlDumper, encoding="utf-8", default_flow_style=False, sort_keys=False)
+
+
+# Percentage cut-offs for the SOW quality bands; a score on a threshold falls in the band above it
+_QUALITY_THRESHOLDS = (40, 60, 80)
+_QUALITY_LEVELS = ("Poor", "Needs Improvement", "Good", "Excellent")
 
 
 def create_sow_summary_export(result):
@@ -971,34 +1078,65 @@ def create_sow_summary_export(result):
     overall_score = result.get('overall_score', 0)
     max_score = result.get('max_score', 9)
     percentage = (overall_score / max_score) * 100 if max_score > 0 else 0
+    now_str = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     
     summary = f"""SOW EVALUATION SUMMARY
-Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+Generated: {now_str}
 
 OVERALL RESULTS:
 - Score: {overall_score:.1f}/{max_score} ({percentage:.1f}%)
-- Quality Level: {"Excellent" if percentage >= 80 else "Good" if percentage >= 60 else "Needs Improvement" if percentage >= 40 else "Poor"}
+- Quality Level: {_QUALITY_LEVELS[bisect_right(_QUALITY_THRESHOLDS, percentage)]}
 
 PHASE BREAKDOWN:
 """
     
+    parts = [summary]
     for phase_name, phase_result in result.get('phase_results', {}).items():
         phase_score = phase_result.get('score', 0)
         phase_percentage = (phase_score / 3) * 100
-        summary += f"- {phase_name.replace('_', ' ').title()}: {phase_score}/3 ({phase_percentage:.1f}%)\n"
+        parts.append(f"- {phase_name.replace('_', ' ').title()}: {phase_score}/3 ({phase_percentage:.1f}%)\n")
     
     if result.get('key_findings'):
-        summary += "\nKEY FINDINGS:\n"
-        for finding in result['key_findings']:
-            summary += f"- {finding}\n"
+        parts.append("\nKEY FINDINGS:\n")
+        parts.extend(f"- {finding}\n" for finding in result['key_findings'])
     
     if result.get('recommendations'):
-        summary += "\nRECOMMENDATIONS:\n"
-        for i, rec in enumerate(result['recommendations'], 1):
-            summary += f"{i}. {rec.get('title', 'Recommendation')}\n"
-            summary += f"   {rec.get('description', '')}\n"
+        parts.append("\nRECOMMENDATIONS:\n")
+        parts.extend(
+            f"{i}. {rec.get('title', 'Recommendation')}\n   {rec.get('description', '')}\n"
+            for i, rec in enumerate(result['recommendations'], 1)
+        )
     
-    return summary
+    return "".join(parts)
+
+
+def _accessor(items):
+    """Pick a dict or attribute getter once for a list whose items are all dicts or all objects."""
+    if items and isinstance(items[0], dict):
+        return lambda item, key, default=None: item.get(key, default)
+    return lambda item, key, default=None: getattr(item, key, default)
+
+
+def _enum_value(value) -> str:
+    """Display string for a field that may be an Enum member or an already-plain value."""
+    return str(getattr(value, "value", value))
+
+
+_APPS_PAGE_SIZE = 50
+
+# Feedback loops are recorded as "<cause>_triggered_<action>"; messages are keyed by the action
+_FEEDBACK_LOOP_MESSAGES = {
+    "wave_replan": "**Wave Replanning**: Modernisation bias detected refactor opportunities, replanned migration waves",
+    "scope_update": "**Scope Update**: Complex architecture patterns detected, updated project scope",
+    "strategy_reclassification": "**Strategy Optimisation**: High effort detected, reclassified to simpler migration strategies",
+}
+
+# Expander titles for GenAI tool plans, keyed by both the enum member and its raw value
+_TOOL_LABELS = {
+    key: tool.value.replace('_', ' ').title()
+    for tool in GenAITool
+    for key in (tool, tool.value)
+}
 
 
 def display_proposal_generator_results(result, show_detailed_analysis, show_phase_breakdown, show_recommendations):
@@ -1007,113 +1145,107 @@ def display_proposal_generator_results(result, show_detailed_analysis, show_phas
     if not result.get("success"):
         st.error("Proposal generation failed!")
         if result.get("errors"):
-            st.error("Errors: " + ", ".join(result["errors"]))
+            st.error(f"Errors: {', '.join(result['errors'])}")
         if result.get("warnings"):
-            st.warning("Warnings: " + ", ".join(result["warnings"]))
+            st.warning(f"Warnings: {', '.join(result['warnings'])}")
         return
     
-    proposal_state = result.get("proposal_state")
-    if not proposal_state:
-        st.error("No proposal state found in results")
+    outputs = result.get("outputs")
+    if not outputs:
+        st.error("No proposal outputs found in results")
         return
     
     # Overall summary
     st.subheader("Proposal Generation Summary")
     
-    col1, col2, col3, col4, col5 = st.columns(5)
+    applications = outputs.get("applications", []) or outputs.get("classified_workloads", [])
     
-    with col1:
-        applications = proposal_state.get("applications", []) or proposal_state.get("classified_workloads", [])
-        st.metric("Applications", len(applications))
+    wave_groups = outputs.get("wave_groups", [])
+    migration_waves = outputs.get("migration_waves", {})
+    waves_count = len(wave_groups) if wave_groups else (len(migration_waves.get("waves", [])) if migration_waves else 0)
     
-    with col2:
-        wave_groups = proposal_state.get("wave_groups", [])
-        migration_waves = proposal_state.get("migration_waves", {})
-        waves_count = len(wave_groups) if wave_groups else (len(migration_waves.get("waves", [])) if migration_waves else 0)
-        st.metric("Migration Waves", waves_count)
-    
-    with col3:
-        sprint_estimates = proposal_state.get("sprint_estimates", [])
-        total_sprints = sum(est.get("total_sprints", 0) for est in sprint_estimates) if sprint_estimates else 0
-        st.metric("Total Sprints", total_sprints)
+    sprint_estimates = outputs.get("sprint_estimates", [])
+    if sprint_estimates and not isinstance(sprint_estimates[0], dict):
+        # SprintEstimate models straight from the graph
+        total_sprints = sum(map(attrgetter("total_sprints"), sprint_estimates))
+    else:
+        total_sprints = sum(est.get("total_sprints", 0) for est in sprint_estimates)
+    total_weeks = total_sprints * 2  # 2-week sprints
     
-    with col4:
-        total_weeks = total_sprints * 2  # 2-week sprints
-        st.metric("Timeline (weeks)", total_weeks)
+    feedback_count = len(result.get("feedback_loops", []))
     
-    with col5:
-        feedback_count = len(result.get("feedback_loops", []))
-        st.metric("Optimisations", feedback_count, help="Number of feedback loops triggered for optimisation")
+    _metric_row([
+        ("Applications", len(applications)),
+        ("Migration Waves", waves_count),
+        ("Total Sprints", total_sprints),
+        ("Timeline (weeks)", total_weeks),
+        ("Optimisations", feedback_count, None, "Number of feedback loops triggered for optimisation")
+    ])
     
     # Show feedback loop information if any occurred
     if result.get("feedback_loops"):
         st.info(f"**Intelligent Optimisation Applied**: {result.get('iterations', 1)} iterations with {len(result['feedback_loops'])} feedback loops")
         
         with st.expander("View Optimisation Details"):
-            st.markdown("**Feedback Loops Triggered:**")
-            for loop in result["feedback_loops"]:
-                if "wave_replan" in loop:
-                    st.markdown("**Wave Replanning**: Modernisation bias detected refactor opportunities, replanned migration waves")
-                elif "scope_update" in loop:
-                    st.markdown("**Scope Update**: Complex architecture patterns detected, updated project scope")
-                elif "strategy_reclassification" in loop:
-                    st.markdown("**Strategy Optimisation**: High effort detected, reclassified to simpler migration strategies")
-                else:
-                    st.markdown(f"**{loop.replace('_', ' ').title()}**")
-            
-            st.markdown(f"**Final Version**: {result.get('iterations', 1)} (optimised through recursive analysis)")
+            st.markdown("\n\n".join(chain(
+                ("**Feedback Loops Triggered:**",),
+                (
+                    _FEEDBACK_LOOP_MESSAGES.get(loop.rpartition("_triggered_")[2])
+                    or f"**{loop.replace('_', ' ').title()}**"
+                    for loop in result["feedback_loops"]
+                ),
+                (f"**Final Version**: {result.get('iterations', 1)} (optimised through recursive analysis)",)
+            )))
     else:
         st.success("**Optimal Plan Generated**: No optimisation loops needed - plan was optimal on first pass")
     
     # Applications Analysis
-    applications = proposal_state.get("applications", []) or proposal_state.get("classified_workloads", [])
     if show_detailed_analysis and applications:
         st.subheader("Application Portfolio Analysis")
         
-        # Create applications dataframe for visualization
-        app_data = []
-        migration_strategies = proposal_state.get("migration_strategies", {})
+        # Build the applications dataframe column by column so pandas doesn't have to pivot row dicts;
+        # the dict-vs-object check is made once for the whole list rather than per attribute per row
+        migration_strategies = outputs.get("migration_strategies", {})
+        get = _accessor(applications)
+        criticality_key = "business_criticality" if isinstance(applications[0], dict) else "criticality"
         
-        for app in applications:
-            # Handle both object and dict formats
-            app_name = app.get("name") if isinstance(app, dict) else getattr(app, "name", "Unknown")
-            app_tech = app.get("technology_stack", []) if isinstance(app, dict) else getattr(app, "technology_stack", [])
-            app_criticality = app.get("business_criticality", "Medium") if isinstance(app, dict) else getattr(app, "criticality", "Medium")
-            app_users = app.get("estimated_users", 0) if isinstance(app, dict) else getattr(app, "estimated_users", 0)
-            
-            strategy = migration_strategies.get(app_name, "Unknown")
+        names = [get(app, "name", "Unknown") for app in applications]
+        techs = [
+            ", ".join(tech[:3]) + ("..." if len(tech) > 3 else "") if tech else "Unknown"
+            for tech in (get(app, "technology_stack", []) for app in applications)
+        ]
+        criticalities = [_enum_value(get(app, criticality_key, "Medium")) for app in applications]
+        strategies = [_enum_value(migration_strategies.get(name, "Unknown")) for name in names]
+        users = [get(app, "estimated_users", 0) or 0 for app in applications]
+        
+        if names:
+            import pandas as pd
             
-            app_data.append({
-                "Application": app_name,
-                "Technology": ", ".join(app_tech[:3]) + ("..." if len(app_tech) > 3 else "") if app_tech else "Unknown",
-                "Criticality": str(app_criticality),
-                "Strategy": str(strategy),
-                "Users": app_users or 0
+            df = pd.DataFrame({
+                "Application": names,
+                "Technology": techs,
+                "Criticality": criticalities,
+                "Strategy": strategies,
+                "Users": users
             })
-        
-        if app_data:
-            df = pd.DataFrame(app_data)
+            # Only send one page of a large portfolio to the frontend; the exports carry the full list
+            if len(df) > _APPS_PAGE_SIZE:
+                page_count = -(-len(df) // _APPS_PAGE_SIZE)
+                page = st.number_input("Page", min_value=1, max_value=page_count, value=1, step=1)
+                start = (page - 1) * _APPS_PAGE_SIZE
+                st.caption(f"Applications {start + 1}-{min(start + _APPS_PAGE_SIZE, len(df))} of {len(df)}")
+                df = df.iloc[start:start + _APPS_PAGE_SIZE]
             st.dataframe(df, use_container_width=True)
             
             # Strategy distribution chart
             if migration_strategies:
-                strategy_counts = {}
-                for strategy in migration_strategies.values():
-                    strategy_name = str(strategy)
-                    strategy_counts[strategy_name] = strategy_counts.get(strategy_name, 0) + 1
+                strategy_counts = Counter(map(_enum_value, migration_strategies.values()))
                 
                 if strategy_counts:
-                    fig = px.pie(
-                        values=list(strategy_counts.values()),
-                        names=list(strategy_counts.keys()),
-                        title="Migration Strategy Distribution"
-                    )
+                    fig = _strategy_pie_figure(tuple(strategy_counts), tuple(strategy_counts.values()))
                     st.plotly_chart(fig, use_container_width=True)
     
     # Wave Planning
-    wave_groups = proposal_state.get("wave_groups", [])
-    migration_waves = proposal_state.get("migration_waves", {})
-    
     if show_phase_breakdown and (wave_groups or migration_waves):
         st.subheader("Migration Wave Planning")
         
@@ -1130,15 +1262,11 @@ def display_proposal_generator_results(result, show_detailed_analysis, show_phas
                         st.markdown(f"**Risk Level:** {getattr(wave, 'risk_level', 'Unknown')}")
                     
                     with col2:
-                        st.markdown("**Applications:**")
-                        for app_name in getattr(wave, "applications", []):
-                            st.markdown(f"• {app_name}")
+                        st.markdown(_bullet_list("**Applications:**", getattr(wave, "applications", [])))
                     
                     prerequisites = getattr(wave, "prerequisites", [])
                     if prerequisites:
-                        st.markdown("**Prerequisites:**")
-                        for prereq in prerequisites:
-                            st.markdown(f"• {prereq}")
+                        st.markdown(_bullet_list("**Prerequisites:**", prerequisites))
         
         # Handle migration_waves format
         elif migration_waves and migration_waves.get("waves"):
@@ -1153,128 +1281,119 @@ def display_proposal_generator_results(result, show_detailed_analysis, show_phas
                         st.markdown(f"**Risk Level:** {wave.get('risk_level', 'Unknown')}")
                     
                     with col2:
-                        st.markdown("**Applications:**")
-                        for app_name in wave.get("applications", []):
-                            st.markdown(f"• {app_name}")
+                        st.markdown(_bullet_list("**Applications:**", wave.get("applications", [])))
                     
                     success_criteria = wave.get("success_criteria", [])
                     if success_criteria:
-                        st.markdown("**Success Criteria:**")
-                        for criteria in success_criteria:
-                            st.markdown(f"• {criteria}")
+                        st.markdown(_bullet_list("**Success Criteria:**", success_criteria))
     
     # Architecture Recommendations
-    architecture_recommendations = proposal_state.get("architecture_recommendations", [])
+    architecture_recommendations = outputs.get("architecture_recommendations", [])
     if show_recommendations and architecture_recommendations:
         st.subheader("Architecture Recommendations")
         
+        get = _accessor(architecture_recommendations)
         for rec in architecture_recommendations:
-            # Handle both object and dict formats
-            if isinstance(rec, dict):
-                cloud_provider = rec.get("cloud_provider", "Unknown")
-                services = rec.get("services", {})
-                patterns = rec.get("patterns", [])
-            else:
-                cloud_provider = getattr(rec, "cloud_provider", "Unknown")
-                services = getattr(rec, "services", {})
-                patterns = getattr(rec, "patterns", [])
+            cloud_provider = get(rec, "cloud_provider", "Unknown")
+            services = get(rec, "services", {})
+            patterns = get(rec, "patterns", [])
             
-            with st.expander(f"{str(cloud_provider).upper()} Architecture"):
+            with st.expander(f"{_enum_value(cloud_provider).upper()} Architecture"):
                 if services:
-                    st.markdown("**Recommended Services:**")
-                    for service_type, service_name in services.items():
-                        st.markdown(f"• **{service_type.title()}:** {service_name}")
+                    st.markdown(_bullet_list(
+                        "**Recommended Services:**",
+                        (f"**{service_type.title()}:** {service_name}" for service_type, service_name in services.items())
+                    ))
                 
                 if patterns:
-                    st.markdown("**Architecture Patterns:**")
-                    for pattern in patterns:
-                        st.markdown(f"• {pattern}")
+                    st.markdown(_bullet_list("**Architecture Patterns:**", patterns))
     
     # GenAI Tools
-    genai_tool_plans = proposal_state.get("genai_tool_plans", [])
+    genai_tool_plans = outputs.get("genai_tool_plans", [])
     if genai_tool_plans:
         st.subheader("GenAI Tool Integration")
         
+        get = _accessor(genai_tool_plans)
         for plan in genai_tool_plans:
-            # Handle both object and dict formats
-            if isinstance(plan, dict):
-                tool_name = plan.get("tool", "Unknown Tool")
-                use_cases = plan.get("use_cases", [])
-                expected_benefits = plan.get("expected_benefits", [])
-            else:
-                tool_name = getattr(plan, "tool", "Unknown Tool")
-                use_cases = getattr(plan, "use_cases", [])
-                expected_benefits = getattr(plan, "expected_benefits", [])
+            tool_name = get(plan, "tool", "Unknown Tool")
+            use_cases = get(plan, "use_cases", [])
+            expected_benefits = get(plan, "expected_benefits", [])
             
-            with st.expander(f"{str(tool_name).replace('_', ' ').title()}"):
+            tool_label = _TOOL_LABELS.get(tool_name) or _enum_value(tool_name).replace('_', ' ').title()
+            with st.expander(tool_label):
                 if use_cases:
-                    st.markdown("**Use Cases:**")
-                    for use_case in use_cases:
-                        st.markdown(f"• {use_case}")
+                    st.markdown(_bullet_list("**Use Cases:**", use_cases))
                 
                 if expected_benefits:
-                    st.markdown("**Expected Benefits:**")
-                    for benefit in expected_benefits:
-                        st.markdown(f"• {benefit}")
+                    st.markdown(_bullet_list("**Expected Benefits:**", expected_benefits))
     
     # Generated Proposal Content
-    markdown_output = proposal_state.get("markdown_output")
+    markdown_output = outputs.get("markdown_output")
     if markdown_output:
         st.subheader("Generated Proposal")
         
         # Show preview
         with st.expander("Preview Proposal Content"):
-            preview_content = markdown_output[:2000] + "..." if len(markdown_output) > 2000 else markdown_output
-            st.markdown(preview_content)
+            st.markdown(markdown_output[:2000])
+            if len(markdown_output) > 2000:
+                st.caption(f"... (+{len(markdown_output) - 2000} chars truncated)")
     
     # Export Options
     st.subheader("Export Proposal")
     
+    ts = datetime.now().strftime('%Y%m%d_%H%M%S')
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        if st.button("Export as Markdown"):
-            if markdown_output:
-                st.download_button(
-                    label="Download Markdown",
-                    data=markdown_output,
-                    file_name=f"migration_proposal_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md",
-                    mime="text/markdown"
-                )
-            else:
-                st.error("No markdown content available")
+        st.download_button(
+            label="Download Markdown",
+            # Encoded only on click so a large proposal isn't re-sent on every rerun
+            data=lambda: markdown_output.encode("utf-8"),
+            file_name=f"migration_proposal_{ts}.md",
+            mime="text/markdown",
+            on_click="ignore",
+            disabled=not markdown_output,
+            help=None if markdown_output else "No markdown content available"
+        )
     
     with col2:
-        if st.button("Export as YAML"):
-            yaml_content = create_proposal_generator_yaml_export(result)
-            st.download_button(
-                label="Download YAML",
-                data=yaml_content,
-                file_name=f"proposal_generator_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.yaml",
-                mime="text/yaml"
-            )
+        st.download_button(
+            label="Download YAML",
+            data=lambda: create_proposal_generator_yaml_export(result),
+            file_name=f"proposal_generator_report_{ts}.yaml",
+            mime="text/yaml",
+            on_click="ignore"
+        )
     
     with col3:
-        if st.button("Export as JSON"):
-            import json
-            # Convert proposal state to dict for JSON serialization
-            proposal_dict = {
-                "success": result.get("success"),
-                "applications": applications,
-                "wave_groups": wave_groups,
-                "migration_waves": migration_waves,
-                "feedback_loops": result.get("feedback_loops", []),
-                "iterations": result.get("iterations", 1),
-                "optimisation_applied": len(result.get("feedback_loops", [])) > 0
-            }
-            
-            json_content = json.dumps(proposal_dict, indent=2, default=str)
-            st.download_button(
-                label="Download JSON",
-                data=json_content,
-                file_name=f"proposal_generator_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
-                mime="application/json"
-            )
+        st.download_button(
+            label="Download JSON",
+            data=lambda: create_proposal_generator_json_export(result, applications, wave_groups, migration_waves),
+            file_name=f"proposal_generator_report_{ts}.json",
+            mime="application/json",
+            on_click="ignore"
+        )
+
+
+def create_proposal_generator_json_export(result, applications, wave_groups, migration_waves) -> bytes:
+    """Create JSON export for proposal generator results."""
+    proposal_dict = {
+        "success": result.get("success"),
+        "applications": applications,
+        "wave_groups": wave_groups,
+        "migration_waves": migration_waves,
+        "feedback_loops": result.get("feedback_loops", []),
+        "iterations": result.get("iterations", 1),
+        "optimisation_applied": len(result.get("feedback_loops", [])) > 0
+    }
+    
+    # Not routed through the cached _dump_json: applications and waves may be
+    # arbitrary objects that st.cache_data can't hash
+    return orjson.dumps(
+        proposal_dict,
+        default=_model_json_default,
+        option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+    )
 
 
 def create_proposal_generator_yaml_export(result):
@@ -1287,7 +1406,7 @@ def create_proposal_generator_yaml_export(result):
             'content': result.get('content', 'No proposal content provided')
         }
     }
-    return yaml.dump(export_data, default_flow_style=False, sort_keys=False)
+    return yaml.dump(export_data, Dumper=YamlDumper, encoding="utf-8", default_flow_style=False, sort_keys=False)
 
 
 if __name__ == "__main__":
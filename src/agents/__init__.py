@@ -5,30 +5,53 @@ import os
 from dotenv import load_dotenv
 load_dotenv()
 
-# Document evaluator agents
-from .parse_input_doc import parse_input_doc_node
-from .extract_intent_and_phases import extract_intent_and_phases_node
-from .phase_evaluator import create_phase_evaluator_node
-from .spec_checker import spec_checker_node
-from .gap_highlighter import gap_highlighter_node
-from .recommendations_generator import recommendations_generator_node
-from .scoring_node import scoring_node
-from .sow_evaluator import evaluate_sow_document
+import importlib
 
-# Proposal generation agents
+# These two share their submodule's name, so they are bound eagerly: a lazy export
+# would be shadowed by the submodule once something imports it directly
+from .scoring_node import scoring_node
 from .parse_discovery_input import parse_discovery_input
-from .workload_classifier import classify_workloads
-from .content_generator import generate_overview_and_scope
-from .wave_planner import plan_migration_waves
-from .migration_strategist import classify_migration_strategies
-from .proposal_formatter import format_proposal_sections, create_output_files
-from .proposal_nodes import provide_architecture_advice, plan_genai_tools, estimate_sprint_efforts
+
+# The remaining agents are imported on first attribute access (PEP 562) rather than here,
+# so importing one agent module doesn't pull in every other agent and its LLM client
+_LAZY = {
+    # Document evaluator agents
+    'parse_input_doc_node': '.parse_input_doc',
+    'extract_intent_and_phases_node': '.extract_intent_and_phases',
+    'create_phase_evaluator_node': '.phase_evaluator',
+    'create_batch_phase_evaluator_node': '.phase_evaluator',
+    'spec_checker_node': '.spec_checker',
+    'gap_highlighter_node': '.gap_highlighter',
+    'recommendations_generator_node': '.recommendations_generator',
+    'evaluate_sow_document': '.sow_evaluator',
+    
+    # Proposal generation agents
+    'classify_workloads': '.workload_classifier',
+    'generate_overview_and_scope': '.content_generator',
+    'plan_migration_waves': '.wave_planner',
+    'classify_migration_strategies': '.migration_strategist',
+    'format_proposal_sections': '.proposal_formatter',
+    'create_output_files': '.proposal_formatter',
+    'provide_architecture_advice': '.proposal_nodes',
+    'plan_genai_tools': '.proposal_nodes',
+    'estimate_sprint_efforts': '.proposal_nodes'
+}
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     # Document evaluator agents
     'parse_input_doc_node',
     'extract_intent_and_phases_node',
     'create_phase_evaluator_node',
+    'create_batch_phase_evaluator_node',
     'spec_checker_node',
     'gap_highlighter_node',
     'recommendations_generator_node',
@@ -1,4 +1,4 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Callable
 import yaml
 from pathlib import Path
 from langchain_openai import ChatOpenAI
@@ -25,16 +25,10 @@ class PhaseEvaluator:
     def evaluate(self, content: str, context: Dict[str, Any] = None) -> PhaseEvaluation:
         """Evaluate the phase content against the specification."""
         
-        phase_spec = self.spec["migrate_ai_specification"]["phases"][self.phase.value]
-        
         prompt = ChatPromptTemplate.from_messages([
             ("system", f"""You are a migrate.ai evaluation expert. Your task is to evaluate the {self.phase.value.upper()} phase content against the migrate.ai Agent-Led Migration Specification.
 
-Phase: {phase_spec['name']}
-Description: {phase_spec['description']}
-
-Workstreams to evaluate:
-{self._format_workstreams(phase_spec['workstreams'])}
+{self.describe()}
 
 Evaluation criteria:
 1. Completeness of workstream coverage
@@ -78,14 +72,27 @@ Return your response as JSON with this structure:
             )
         except (json.JSONDecodeError, KeyError) as e:
             # Fallback if JSON parsing fails
-            return PhaseEvaluation(
-                phase=self.phase,
-                score=1,
-                strengths=["Content provided for evaluation"],
-                weaknesses=[f"Could not parse evaluation response: {str(e)}"],
-                evidence=["Response parsing failed"],
-                recommendations=["Please review the content format and try again"]
-            )
+            return self.fallback(str(e))
+    
+    def describe(self) -> str:
+        """Describe the phase and its workstreams for inclusion in a prompt."""
+        phase_spec = self.spec["migrate_ai_specification"]["phases"][self.phase.value]
+        return f"""Phase: {phase_spec['name']}
+Description: {phase_spec['description']}
+
+Workstreams to evaluate:
+{self._format_workstreams(phase_spec['workstreams'])}"""
+    
+    def fallback(self, reason: str) -> PhaseEvaluation:
+        """Evaluation used when the LLM response for this phase cannot be parsed."""
+        return PhaseEvaluation(
+            phase=self.phase,
+            score=1,
+            strengths=["Content provided for evaluation"],
+            weaknesses=[f"Could not parse evaluation response: {reason}"],
+            evidence=["Response parsing failed"],
+            recommendations=["Please review the content format and try again"]
+        )
     
     def _format_workstreams(self, workstreams: list) -> str:
         """Format workstreams for the prompt."""
@@ -98,6 +105,101 @@ Return your response as JSON with this structure:
 # Initialize LLM
 llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
 
+# Maximum number of phases evaluated in one batched LLM call, to stay inside the context window
+PHASE_BATCH_SIZE = 6
+
+_evaluators: Dict[MigrationPhase, PhaseEvaluator] = {}
+
+
+def _get_evaluator(phase: MigrationPhase) -> PhaseEvaluator:
+    """Return the shared evaluator for a phase, loading its spec on first use."""
+    if phase not in _evaluators:
+        _evaluators[phase] = PhaseEvaluator(phase)
+    return _evaluators[phase]
+
+
+def batch_evaluate_phases(phase_contents: Dict[MigrationPhase, str]) -> List[PhaseEvaluation]:
+    """
+    Evaluate several phases with one LLM call per batch instead of one call per phase.
+    
+    Args:
+        phase_contents: Content to evaluate, keyed by phase
+        
+    Returns:
+        One PhaseEvaluation per phase, in the order given
+    """
+    phases = list(phase_contents)
+    evaluations = []
+    json_llm = llm.bind(response_format={"type": "json_object"})
+    
+    for start in range(0, len(phases), PHASE_BATCH_SIZE):
+        batch = phases[start:start + PHASE_BATCH_SIZE]
+        
+        phase_sections = "\n\n".join(
+            f"=== {phase.value} ===\n{_get_evaluator(phase).describe()}" for phase in batch
+        )
+        content_sections = "\n\n".join(
+            f"=== {phase.value} ===\n{phase_contents[phase]}" for phase in batch
+        )
+        
+        messages = [
+            ("system", f"""You are a migrate.ai evaluation expert. Your task is to evaluate the content for each of the following phases against the migrate.ai Agent-Led Migration Specification.
+
+{phase_sections}
+
+Evaluation criteria for every phase:
+1. Completeness of workstream coverage
+2. Quality of implementation approach
+3. Alignment with migrate.ai principles
+4. Technical feasibility and best practices
+5. Risk management and mitigation strategies
+
+For each phase provide:
+1. Overall score (0-3): 0=Poor, 1=Basic, 2=Good, 3=Excellent
+2. Strengths: What is done well
+3. Weaknesses: What needs improvement
+4. Evidence: Specific examples from the content
+5. Recommendations: Specific improvements needed
+
+Return your response as a JSON object keyed by phase id, each with this structure:
+{{
+    "score": <number>,
+    "strengths": [<list of strings>],
+    "weaknesses": [<list of strings>],
+    "evidence": [<list of strings>],
+    "recommendations": [<list of strings>]
+}}"""),
+            ("user", f"Evaluate the content for each phase:\n\n{content_sections}")
+        ]
+        
+        # Messages are passed as-is: the phase content may contain braces a prompt template would misread
+        response = json_llm.invoke(messages)
+        
+        try:
+            results = parse_llm_json_response(response.content)
+        except ValueError as e:
+            results = {}
+            reason = str(e)
+        else:
+            reason = "phase missing from batched response"
+        
+        for phase in batch:
+            result = results.get(phase.value)
+            if not isinstance(result, dict):
+                evaluations.append(_get_evaluator(phase).fallback(reason))
+                continue
+            
+            evaluations.append(PhaseEvaluation(
+                phase=phase,
+                score=result.get("score", 0),
+                strengths=result.get("strengths", []),
+                weaknesses=result.get("weaknesses", []),
+                evidence=result.get("evidence", []),
+                recommendations=result.get("recommendations", [])
+            ))
+    
+    return evaluations
+
 
 def create_phase_evaluator_node(phase: MigrationPhase):
     """Create a phase evaluator node for the given phase."""
@@ -136,4 +238,35 @@ def create_phase_evaluator_node(phase: MigrationPhase):
 # Create individual node functions for each stage
 strategise_and_plan_evaluator_node = create_phase_evaluator_node(MigrationPhase.STRATEGISE_AND_PLAN)
 migrate_and_modernise_evaluator_node = create_phase_evaluator_node(MigrationPhase.MIGRATE_AND_MODERNISE)
-manage_and_optimise_evaluator_node = create_phase_evaluator_node(MigrationPhase.MANAGE_AND_OPTIMISE) 
\ No newline at end of file
+manage_and_optimise_evaluator_node = create_phase_evaluator_node(MigrationPhase.MANAGE_AND_OPTIMISE)
+
+
+def create_batch_phase_evaluator_node(select_phases: Callable[[Any], List[MigrationPhase]]):
+    """Create a node that evaluates every phase chosen by ``select_phases`` in batched LLM calls."""
+    
+    def evaluate_phases(state: GraphState) -> Dict[str, Any]:
+        """Evaluate the selected phases together."""
+        try:
+            selected = set(select_phases(state))
+            phase_contents = {
+                pc.phase: pc.relevant_content
+                for pc in state.phase_contents
+                if pc.phase in selected and pc.relevant_content
+            }
+            
+            if not phase_contents:
+                return {
+                    "error": "No content found for the selected phases"
+                }
+            
+            # Only the new evaluations: the add_to_list reducer appends them to the state
+            return {
+                "phase_evaluations": batch_evaluate_phases(phase_contents)
+            }
+            
+        except Exception as e:
+            return {
+                "error": f"Batched phase evaluation failed: {str(e)}"
+            }
+    
+    return evaluate_phases
@@ -1,7 +1,6 @@
 from typing import Dict, Any, List
 import yaml
 from pathlib import Path
-import time
 
 
 def evaluate_sow_document(content: str) -> Dict[str, Any]:
@@ -12,9 +11,6 @@ def evaluate_sow_document(content: str) -> Dict[str, Any]:
     The actual evaluation logic will be implemented later.
     """
     
-    # Simulate processing time
-    time.sleep(2)
-    
     # Mock evaluation results for demonstration
     phases = ["scope_definition", "dependencies_analysis", "assumptions_review"]
     
@@ -1,4 +1,5 @@
-from typing import Dict, Any, List
+import logging
+from typing import Dict, Any, Iterator, List, Optional
 from langgraph.graph import StateGraph, END
 from langgraph.graph.graph import CompiledGraph
 
@@ -9,13 +10,16 @@ from ..agents.extract_intent_and_phases import extract_intent_and_phases_node
 from ..agents.phase_evaluator import (
     strategise_and_plan_evaluator_node,
     migrate_and_modernise_evaluator_node,
-    manage_and_optimise_evaluator_node
+    manage_and_optimise_evaluator_node,
+    create_batch_phase_evaluator_node
 )
 from ..agents.spec_checker import spec_checker_node
 from ..agents.gap_highlighter import gap_highlighter_node
 from ..agents.recommendations_generator import recommendations_generator_node
 from ..agents.scoring_node import scoring_node
 
+logger = logging.getLogger(__name__)
+
 
 def should_evaluate_phase(state: GraphState, phase: MigrationPhase) -> bool:
     """Determine if a phase should be evaluated based on content relevance."""
@@ -29,32 +33,21 @@ def should_evaluate_phase(state: GraphState, phase: MigrationPhase) -> bool:
     return False
 
 
-def route_after_phase_extraction(state: GraphState) -> List[str]:
-    """Route to only the relevant phase evaluators based on content analysis."""
-    next_nodes = []
-    
-    print("DEBUG ROUTING: Phase content analysis:")
-    for phase_content in state.phase_contents:
-        print(f"  {phase_content.phase.value}: confidence={phase_content.confidence_score:.2f}, content='{phase_content.relevant_content[:100]}...'")
-    
-    # Check each phase and only route to evaluators for relevant phases
-    if should_evaluate_phase(state, MigrationPhase.STRATEGISE_AND_PLAN):
-        next_nodes.append("strategise_and_plan_evaluator")
-        print("DEBUG ROUTING: Adding strategise_and_plan_evaluator")
-    
-    if should_evaluate_phase(state, MigrationPhase.MIGRATE_AND_MODERNISE):
-        next_nodes.append("migrate_and_modernise_evaluator")
-        print("DEBUG ROUTING: Adding migrate_and_modernise_evaluator")
-    
-    if should_evaluate_phase(state, MigrationPhase.MANAGE_AND_OPTIMISE):
-        next_nodes.append("manage_and_optimise_evaluator")
-        print("DEBUG ROUTING: Adding manage_and_optimise_evaluator")
+# Evaluator node for each phase when it is the only one selected
+PHASE_EVALUATOR_NODES = {
+    MigrationPhase.STRATEGISE_AND_PLAN: "strategise_and_plan_evaluator",
+    MigrationPhase.MIGRATE_AND_MODERNISE: "migrate_and_modernise_evaluator",
+    MigrationPhase.MANAGE_AND_OPTIMISE: "manage_and_optimise_evaluator",
+}
+
+
+def select_relevant_phases(state: GraphState) -> List[MigrationPhase]:
+    """Select the phases worth evaluating based on content analysis."""
+    phases = [phase for phase in PHASE_EVALUATOR_NODES if should_evaluate_phase(state, phase)]
     
-    # If no phases are relevant enough, still run at least one evaluator
+    # If no phases are relevant enough, still evaluate the best one
     # to provide feedback on why the document doesn't align
-    if not next_nodes:
-        print("DEBUG ROUTING: No phases above threshold, selecting best phase")
-        # Find the phase with highest confidence score
+    if not phases:
         best_phase = None
         best_score = 0
         for phase_content in state.phase_contents:
@@ -62,16 +55,22 @@ def route_after_phase_extraction(state: GraphState) -> List[str]:
                 best_score = phase_content.confidence_score
                 best_phase = phase_content.phase
         
-        print(f"DEBUG ROUTING: Best phase is {best_phase.value if best_phase else 'None'} with score {best_score}")
-        
-        if best_phase == MigrationPhase.STRATEGISE_AND_PLAN:
-            next_nodes.append("strategise_and_plan_evaluator")
-        elif best_phase == MigrationPhase.MIGRATE_AND_MODERNISE:
-            next_nodes.append("migrate_and_modernise_evaluator")
-        else:
-            next_nodes.append("manage_and_optimise_evaluator")
-    
-    print(f"DEBUG ROUTING: Final routing decision: {next_nodes}")
+        logger.debug("No phases above threshold, best phase is %s with score %s", best_phase.value if best_phase else None, best_score)
+        phases.append(best_phase or MigrationPhase.MANAGE_AND_OPTIMISE)
+    
+    return phases
+
+
+def route_after_phase_extraction(state: GraphState) -> List[str]:
+    """Route to the relevant phase evaluator, batching several phases into one LLM call."""
+    phases = select_relevant_phases(state)
+    
+    if len(phases) > 1:
+        next_nodes = ["batch_phase_evaluator"]
+    else:
+        next_nodes = [PHASE_EVALUATOR_NODES[phases[0]]]
+    
+    logger.debug("Routing to %s for phases %s", next_nodes, [phase.value for phase in phases])
     return next_nodes
 
 
@@ -87,6 +86,7 @@ def create_evaluation_graph() -> CompiledGraph:
     workflow.add_node("strategise_and_plan_evaluator", strategise_and_plan_evaluator_node)
     workflow.add_node("migrate_and_modernise_evaluator", migrate_and_modernise_evaluator_node)
     workflow.add_node("manage_and_optimise_evaluator", manage_and_optimise_evaluator_node)
+    workflow.add_node("batch_phase_evaluator", create_batch_phase_evaluator_node(select_relevant_phases))
     workflow.add_node("spec_checker", spec_checker_node)
     workflow.add_node("gap_highlighter", gap_highlighter_node)
     workflow.add_node("recommendations_generator", recommendations_generator_node)
@@ -105,7 +105,8 @@ def create_evaluation_graph() -> CompiledGraph:
         {
             "strategise_and_plan_evaluator": "strategise_and_plan_evaluator",
             "migrate_and_modernise_evaluator": "migrate_and_modernise_evaluator", 
-            "manage_and_optimise_evaluator": "manage_and_optimise_evaluator"
+            "manage_and_optimise_evaluator": "manage_and_optimise_evaluator",
+            "batch_phase_evaluator": "batch_phase_evaluator"
         }
     )
     
@@ -113,6 +114,7 @@ def create_evaluation_graph() -> CompiledGraph:
     workflow.add_edge("strategise_and_plan_evaluator", "spec_checker")
     workflow.add_edge("migrate_and_modernise_evaluator", "spec_checker")
     workflow.add_edge("manage_and_optimise_evaluator", "spec_checker")
+    workflow.add_edge("batch_phase_evaluator", "spec_checker")
     
     # Sequential flow after spec checker
     workflow.add_edge("spec_checker", "gap_highlighter")
@@ -123,6 +125,10 @@ def create_evaluation_graph() -> CompiledGraph:
     return workflow.compile()
 
 
+# Upper bound on graph nodes run per evaluation, used to scale streamed progress
+MAX_EVALUATION_STEPS = 7
+
+
 class EvaluationOrchestrator:
     """Main orchestrator for the evaluation process."""
     
@@ -144,59 +150,107 @@ class EvaluationOrchestrator:
             # Parse the document first
             parsed_doc = DocumentParser.parse_document(file_content, filename)
             
-            # Create initial state
-            initial_state = GraphState(parsed_document=parsed_doc)
-            
             # Run the evaluation graph
-            final_state = self.graph.invoke(initial_state)
+            final_state = self.graph.invoke(GraphState(parsed_document=parsed_doc))
             
-            # Check for errors - access state attributes properly
-            error = getattr(final_state, 'error', None) or final_state.get('error', None)
-            if error:
-                return {
-                    "success": False,
-                    "error": error,
-                    "partial_results": self._extract_partial_results(final_state)
-                }
+            return self._build_result(final_state, parsed_doc, filename)
+                
+        except Exception as e:
+            return {
+                "success": False,
+                "error": f"Evaluation failed: {str(e)}",
+                "partial_results": None
+            }
+    
+    def iter_evaluate(self, file_content: bytes, filename: str, parsed_doc: Optional[ParsedDocument] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Evaluate a document, yielding a progress event as each graph node completes.
+        
+        Args:
+            file_content: Raw file content as bytes
+            filename: Name of the file for parsing
+            parsed_doc: Already parsed document, if the caller has one
+            
+        Yields:
+            Dictionaries with "stage" (status label), "pct" (0-100) and "partial"
+            (the node's state update). The final event carries "result", the same
+            dictionary evaluate_document returns.
+        """
+        try:
+            if parsed_doc is None:
+                yield {"stage": "Parsing document...", "pct": 5, "partial": None}
+                parsed_doc = DocumentParser.parse_document(file_content, filename)
             
-            # Return successful evaluation
-            evaluation_result = getattr(final_state, 'evaluation_result', None) or final_state.get('evaluation_result', None)
-            if evaluation_result:
-                parsed_doc_attr = getattr(final_state, 'parsed_document', None) or final_state.get('parsed_document', None)
-                phase_evaluations = getattr(final_state, 'phase_evaluations', []) or final_state.get('phase_evaluations', [])
-                gaps = getattr(final_state, 'gaps', []) or final_state.get('gaps', [])
-                recommendations = getattr(final_state, 'recommendations', []) or final_state.get('recommendations', [])
+            final_state = None
+            completed = 0
+            for mode, chunk in self.graph.stream(
+                GraphState(parsed_document=parsed_doc),
+                stream_mode=["updates", "values"]
+            ):
+                if mode == "values":
+                    final_state = chunk
+                    continue
                 
-                return {
-                    "success": True,
-                    "evaluation_result": evaluation_result,
-                    "metadata": {
-                        "document_info": {
-                            "filename": filename,
-                            "document_type": parsed_doc.document_type.value,
-                            "sections_found": list(parsed_doc.sections.keys()),
-                            "content_length": len(parsed_doc.content)
-                        },
-                        "processing_info": {
-                            "phases_evaluated": len(phase_evaluations),
-                            "gaps_identified": len(gaps),
-                            "recommendations_generated": len(recommendations)
-                        }
+                for node, update in chunk.items():
+                    completed += 1
+                    yield {
+                        "stage": f"Completed {node.replace('_', ' ')}...",
+                        "pct": min(95, 10 + completed * 85 // MAX_EVALUATION_STEPS),
+                        "partial": update
                     }
-                }
-            else:
-                return {
-                    "success": False,
-                    "error": "Evaluation completed but no results generated",
-                    "partial_results": self._extract_partial_results(final_state)
-                }
-                
+            
+            result = self._build_result(final_state, parsed_doc, filename)
+            
         except Exception as e:
-            return {
+            result = {
                 "success": False,
                 "error": f"Evaluation failed: {str(e)}",
                 "partial_results": None
             }
+        
+        yield {"stage": "Migration evaluation complete!", "pct": 100, "partial": None, "result": result}
+    
+    def _build_result(self, final_state, parsed_doc: ParsedDocument, filename: str) -> Dict[str, Any]:
+        """Convert the final graph state into the evaluation result dictionary."""
+        # Check for errors - access state attributes properly
+        error = getattr(final_state, 'error', None) or final_state.get('error', None)
+        if error:
+            return {
+                "success": False,
+                "error": error,
+                "partial_results": self._extract_partial_results(final_state)
+            }
+        
+        # Return successful evaluation
+        evaluation_result = getattr(final_state, 'evaluation_result', None) or final_state.get('evaluation_result', None)
+        if evaluation_result:
+            phase_evaluations = getattr(final_state, 'phase_evaluations', []) or final_state.get('phase_evaluations', [])
+            gaps = getattr(final_state, 'gaps', []) or final_state.get('gaps', [])
+            recommendations = getattr(final_state, 'recommendations', []) or final_state.get('recommendations', [])
+            
+            return {
+                "success": True,
+                "evaluation_result": evaluation_result,
+                "metadata": {
+                    "document_info": {
+                        "filename": filename,
+                        "document_type": parsed_doc.document_type.value,
+                        "sections_found": list(parsed_doc.sections.keys()),
+                        "content_length": len(parsed_doc.content)
+                    },
+                    "processing_info": {
+                        "phases_evaluated": len(phase_evaluations),
+                        "gaps_identified": len(gaps),
+                        "recommendations_generated": len(recommendations)
+                    }
+                }
+            }
+        
+        return {
+            "success": False,
+            "error": "Evaluation completed but no results generated",
+            "partial_results": self._extract_partial_results(final_state)
+        }
     
     def _extract_partial_results(self, state) -> Dict[str, Any]:
         """Extract any partial results from a failed evaluation."""
@@ -249,4 +303,4 @@ def evaluate_document(file_content: bytes, filename: str) -> Dict[str, Any]:
         Evaluation results dictionary
     """
     orchestrator = EvaluationOrchestrator()
-    return orchestrator.evaluate_document(file_content, filename) 
\ No newline at end of file
+    return orchestrator.evaluate_document(file_content, filename)
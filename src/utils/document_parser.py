@@ -1,14 +1,13 @@
 import io
 import re
-from typing import Dict, Optional
+from typing import TYPE_CHECKING, Dict, Optional
 from pathlib import Path
 
-import PyPDF2
-from docx import Document
-import pandas as pd
-
 from ..models.evaluation import DocumentType, ParsedDocument
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 
 class DocumentParser:
     """Utility class for parsing various document formats."""
@@ -33,6 +32,8 @@ class DocumentParser:
     @staticmethod
     def _parse_pdf(file_content: bytes, filename: str) -> ParsedDocument:
         """Parse PDF document."""
+        import PyPDF2
+        
         try:
             pdf_file = io.BytesIO(file_content)
             pdf_reader = PyPDF2.PdfReader(pdf_file)
@@ -60,6 +61,8 @@ class DocumentParser:
     @staticmethod
     def _parse_docx(file_content: bytes, filename: str) -> ParsedDocument:
         """Parse DOCX document."""
+        from docx import Document
+        
         try:
             docx_file = io.BytesIO(file_content)
             doc = Document(docx_file)
@@ -122,6 +125,9 @@ class DocumentParser:
     @staticmethod
     def _parse_excel(file_content: bytes, filename: str) -> ParsedDocument:
         """Parse Excel document."""
+        # Format libraries are imported by the parser that needs them, keeping them off every other import path
+        import pandas as pd
+        
         try:
             excel_file = io.BytesIO(file_content)
             
@@ -189,8 +195,10 @@ class DocumentParser:
             raise ValueError(f"Error parsing Excel file: {str(e)}")
     
     @staticmethod
-    def _extract_excel_sections(excel_data: Dict[str, pd.DataFrame]) -> Dict[str, str]:
+    def _extract_excel_sections(excel_data: Dict[str, "pd.DataFrame"]) -> Dict[str, str]:
         """Extract sections from Excel data based on sheet names and content."""
+        import pandas as pd
+        
         sections = {}
         
         for sheet_name, df in excel_data.items():